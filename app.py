@@ -3,52 +3,70 @@ Meeting Summarizer - Applicazione Gradio
 Web app per l'analisi e sintesi automatica di meeting tramite GPT-4o-mini.
 """
 
+import atexit
 import os
 import tempfile
 import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import gradio as gr
-from typing import Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 
-# Import moduli locali
+# Import moduli locali (analisi LLM, PDF e dataset sono importati al primo utilizzo
+# in process_meeting per non rallentare l'avvio dell'interfaccia)
 from utils.text_extraction import extract_text, get_supported_extensions
-from utils.transcription import transcribe_audio, is_audio_file, get_supported_audio_extensions
-from utils.llm_analysis import analyze_meeting, format_analysis_for_display
-from utils.pdf_generator import generate_pdf, cleanup_temp_pdf
-from utils.data_persistence import save_meeting_to_dataset
+from utils.transcription import transcribe_audio, transcribe_audio_batch, get_supported_audio_extensions
 
-# Configurazione logging
+# Logger (configurato in main)
 import logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Variabili globali per file temporanei
-_temp_files = []
+# File temporanei per sessione Gradio (session_hash -> percorsi)
+_temp_files: Dict[str, List[str]] = {}
+_temp_files_lock = threading.Lock()
 
+# Executor per generazione PDF e salvataggio dataset in parallelo
+_EXECUTOR = ThreadPoolExecutor(max_workers=4)
 
+# Tempo massimo di attesa per il PDF (secondi)
+PDF_TIMEOUT = 30
 
-def process_meeting(file, api_key: str, hf_token: str = "") -> Tuple[str, str, str, str, str]:
+# Funzione di estrazione del testo per estensione: (tipo, handler)
+_DISPATCH = (
+    {ext: ("audio", transcribe_audio) for ext in get_supported_audio_extensions()}
+    | {ext: ("document", extract_text) for ext in get_supported_extensions()}
+)
+
+
+
+def process_meeting(file, api_key: str, hf_token: str = "", request: gr.Request = None) -> Iterator[Tuple[str, str, str, str, str]]:
     """
-    Processa un file di meeting e restituisce l'analisi completa.
+    Processa un file di meeting e restituisce l'analisi man mano che viene generata.
     
     Args:
         file: File caricato dall'utente
         api_key (str): Chiave API OpenAI
         hf_token (str): Token Hugging Face (opzionale)
+        request (gr.Request): Richiesta Gradio (iniettata automaticamente)
         
-    Returns:
+    Yields:
         Tuple[str, str, str, str, str]: (summary, topics, keywords, pdf_path, message)
     """
-    global _temp_files
-
     try:
+        # Import moduli pesanti (openai, reportlab)
+        from utils.llm_analysis import analyze_meeting_stream, format_analysis_for_display
+        from utils.pdf_generator import generate_pdf
+        
         # Verifica input e debug
         logger.info(f"DEBUG: file ricevuto tipo={type(file)} valore={file}")
         
         if not file:
-            return "", "", "", None, "❌ Error: No file uploaded"
+            yield "", "", "", None, "❌ Error: No file uploaded"
+            return
         
         if not api_key:
-            return "", "", "", None, "❌ Error: OpenAI API key required"
+            yield "", "", "", None, "❌ Error: OpenAI API key required"
+            return
         
         # Gestisci l'oggetto file di Gradio
         # Nelle versioni recenti di Gradio, il file può essere una stringa (path) o un oggetto
@@ -62,10 +80,12 @@ def process_meeting(file, api_key: str, hf_token: str = "") -> Tuple[str, str, s
         
         # Verify that the file exists and is a file (not a directory)
         if not os.path.exists(file_path):
-            return "", "", "", None, "❌ Error: File not found or invalid"
+            yield "", "", "", None, "❌ Error: File not found or invalid"
+            return
         
         if not os.path.isfile(file_path):
-            return "", "", "", None, f"❌ Error: Path is a directory, not a file: {file_path}"
+            yield "", "", "", None, f"❌ Error: Path is a directory, not a file: {file_path}"
+            return
         
         # Estrai testo dal file
         text = ""
@@ -74,37 +94,89 @@ def process_meeting(file, api_key: str, hf_token: str = "") -> Tuple[str, str, s
         logger.info(f"Processamento file: {file_name}")
         logger.info(f"Percorso file: {file_path}")
         
-        # Determine if it's an audio file
-        if is_audio_file(file_name):
+        # Find the handler for the file type
+        file_extension = os.path.splitext(file_name)[1].lower()
+        kind, handler = _DISPATCH.get(file_extension, (None, None))
+        if handler is None:
+            yield "", "", "", None, f"❌ Error: Unsupported file format: {file_extension}"
+            return
+        
+        if kind == "audio":
             logger.info("Audio file detected, starting transcription...")
-            text = transcribe_audio(file_path)
-            if not text:
-                return "", "", "", None, "❌ Error: Transcription failed"
-            logger.info("Transcription completed")
         else:
-            # Extract text from document
             logger.info("Document file detected, extracting text...")
-            text = extract_text(file_path)
-            if not text:
-                return "", "", "", None, "❌ Error: Text extraction failed"
-            logger.info("Text extraction completed")
+        
+        text = handler(file_path)
+        if not text:
+            error = "Transcription failed" if kind == "audio" else "Text extraction failed"
+            yield "", "", "", None, f"❌ Error: {error}"
+            return
+        logger.info("Transcription completed" if kind == "audio" else "Text extraction completed")
         
         # Verify that the text is not empty
         if not text.strip():
-            return "", "", "", None, "❌ Error: No text extracted from file"
+            yield "", "", "", None, "❌ Error: No text extracted from file"
+            return
         
-        # Analyze with GPT-4o-mini
+        # Analyze with GPT-4o-mini, showing fields as soon as they are generated
         logger.info("Starting analysis with GPT-4o-mini...")
-        analysis = analyze_meeting(text, api_key)
+        analysis = None
+        for analysis in analyze_meeting_stream(text, api_key):
+            if not analysis:
+                break
+            formatted_analysis = format_analysis_for_display(analysis)
+            yield (
+                formatted_analysis["summary"],
+                formatted_analysis["topics"],
+                formatted_analysis["keywords"],
+                None,
+                "⏳ Analyzing with GPT-4o-mini..."
+            )
+        
         if not analysis:
-            return "", "", "", None, "❌ Error: Analysis failed"
+            yield "", "", "", None, "❌ Error: Analysis failed"
+            return
+        
+        # PDF generation and dataset save only need the analysis: start them now
+        logger.info("Generating PDF...")
+        pdf_future = _EXECUTOR.submit(generate_pdf, analysis)
+        
+        # Save to dataset if token provided (in background)
+        if hf_token:
+            # Import solo se serve (pyarrow, huggingface_hub)
+            from utils.data_persistence import save_meeting_to_dataset
+            
+            logger.info("Saving to Hugging Face Dataset...")
+            meeting_data = {
+                "file_name": file_name,
+                "transcription": text,
+                "summary": analysis.get("summary", ""),
+                "topics": analysis.get("topics", []),
+                "keywords": analysis.get("keywords", [])
+            }
+            hf_future = _EXECUTOR.submit(save_meeting_to_dataset, meeting_data, hf_token)
+            hf_future.add_done_callback(_log_dataset_save)
         
         # Formatta per display
         formatted_analysis = format_analysis_for_display(analysis)
         
-        # Generate PDF
-        logger.info("Generating PDF...")
-        pdf_path = generate_pdf(analysis)
+        # Show the final analysis while the PDF is generated
+        yield (
+            formatted_analysis["summary"],
+            formatted_analysis["topics"],
+            formatted_analysis["keywords"],
+            None,
+            "⏳ Generating PDF..."
+        )
+        
+        try:
+            pdf_path = pdf_future.result(timeout=PDF_TIMEOUT)
+        except FutureTimeoutError:
+            logger.warning(f"PDF generation did not finish within {PDF_TIMEOUT}s")
+            pdf_path = None
+            # Nessuno scaricherà il PDF: eliminarlo quando il worker lo scrive
+            if not pdf_future.cancel():
+                pdf_future.add_done_callback(_discard_late_pdf)
         
         # Debug: verify that pdf_path is valid
         if pdf_path:
@@ -116,33 +188,19 @@ def process_meeting(file, api_key: str, hf_token: str = "") -> Tuple[str, str, s
                 logger.warning(f"PDF path invalid: {pdf_path}")
                 pdf_path = None
         
-        # Save to dataset if token provided
-        if hf_token:
-            logger.info("Saving to Hugging Face Dataset...")
-            meeting_data = {
-                "file_name": file_name,
-                "transcription": text,
-                "summary": analysis.get("summary", ""),
-                "topics": analysis.get("topics", []),
-                "keywords": analysis.get("keywords", [])
-            }
-            
-            if save_meeting_to_dataset(meeting_data, hf_token):
-                logger.info("Meeting saved to HF Dataset")
-            else:
-                logger.warning("Saving to HF Dataset failed")
-        
-        # Add PDF to temporary files for cleanup
+        # Add PDF to the session's temporary files for cleanup
         if pdf_path:
-            _temp_files.append(pdf_path)
+            session = request.session_hash if request is not None else None
+            with _temp_files_lock:
+                _temp_files.setdefault(session, []).append(pdf_path)
         
         # Success message
-        success_msg = f"✅ Meeting analyzed successfully!\n\n📄 File: {file_name}\n📝 Characters analyzed: {len(text)}\n📊 Topics identified: {len(analysis.get('topics', []))}\n🔑 Keywords: {len(analysis.get('keywords', []))}"
+        success_msg = f"✅ Meeting analyzed successfully!\n\n📄 File: {file_name}\n📝 Tokens analyzed: {analysis.get('token_count', 0)}\n📊 Topics identified: {len(analysis.get('topics', []))}\n🔑 Keywords: {len(analysis.get('keywords', []))}"
         
         if hf_token:
-            success_msg += "\n💾 Data saved to Hugging Face Dataset"
+            success_msg += "\n💾 Saving data to Hugging Face Dataset in background"
         
-        return (
+        yield (
             formatted_analysis["summary"],
             formatted_analysis["topics"], 
             formatted_analysis["keywords"],
@@ -152,19 +210,175 @@ def process_meeting(file, api_key: str, hf_token: str = "") -> Tuple[str, str, s
         
     except Exception as e:
         logger.error(f"Error during processing: {str(e)}")
-        return "", "", "", None, f"❌ Error: {str(e)}"
+        yield "", "", "", None, f"❌ Error: {str(e)}"
 
 
-def cleanup_temp_files():
-    """Clean up temporary files."""
-    global _temp_files
-    for file_path in _temp_files:
+def process_batch(files, api_key: str) -> Iterator[Tuple[str, str, str]]:
+    """
+    Invia più file di meeting con un unico job della Batch API di OpenAI.
+    
+    Il job viene solo inviato: i risultati si recuperano con check_batch
+    usando il batch id restituito.
+    
+    Args:
+        files: File caricati dall'utente
+        api_key (str): Chiave API OpenAI
+    
+    Yields:
+        Tuple[str, str, str]: (results_markdown, message, batch_id)
+    """
+    try:
+        from utils.llm_analysis import submit_meetings_batch
+        
+        if not files:
+            yield "", "❌ Error: No files uploaded", ""
+            return
+        
+        if not api_key:
+            yield "", "❌ Error: OpenAI API key required", ""
+            return
+        
+        # Extract text from every document, collect audio files
+        file_paths = [file if isinstance(file, str) else (file.name if hasattr(file, 'name') else str(file)) for file in files]
+        file_names = [os.path.basename(file_path) for file_path in file_paths]
+        texts = [""] * len(file_paths)
+        audio_indices = []
+        for i, file_path in enumerate(file_paths):
+            kind, handler = _DISPATCH.get(os.path.splitext(file_path)[1].lower(), (None, None))
+            if handler is None or not os.path.isfile(file_path):
+                continue
+            if kind == "audio":
+                audio_indices.append(i)
+            else:
+                texts[i] = handler(file_path) or ""
+        
+        # Audio files are transcribed together in batches
+        if audio_indices:
+            yield "", f"⏳ Transcribing {len(audio_indices)} audio files...", ""
+            transcriptions = transcribe_audio_batch([file_paths[i] for i in audio_indices])
+            for i, transcription in zip(audio_indices, transcriptions):
+                texts[i] = transcription or ""
+        
+        for file_name, text in zip(file_names, texts):
+            if not text:
+                logger.warning(f"No text extracted from {file_name}")
+        
+        batch_id = submit_meetings_batch(texts, api_key, labels=file_names)
+        if batch_id is None:
+            yield "", "❌ Error: Batch submission failed", ""
+            return
+        
+        yield (
+            "",
+            f"⏳ Batch {batch_id} queued for {len(file_names)} files (results within 24h). "
+            "Use \"Check batch status\" to collect them.",
+            batch_id
+        )
+    
+    except Exception as e:
+        logger.error(f"Error during batch processing: {str(e)}")
+        yield "", f"❌ Error: {str(e)}", ""
+
+
+def check_batch(batch_id: str, api_key: str) -> Tuple[str, str]:
+    """
+    Controlla un job della Batch API e mostra i risultati se completato.
+    
+    Args:
+        batch_id (str): Batch id restituito da process_batch
+        api_key (str): Chiave API OpenAI usata per l'invio
+    
+    Returns:
+        Tuple[str, str]: (results_markdown, message)
+    """
+    try:
+        from utils.llm_analysis import get_batch_results, format_analysis_for_display
+        
+        batch_id = (batch_id or "").strip()
+        if not batch_id:
+            return "", "❌ Error: Batch ID required"
+        
+        if not api_key:
+            return "", "❌ Error: OpenAI API key required"
+        
+        batch = get_batch_results(batch_id, api_key)
+        if batch is None:
+            return "", f"❌ Error: Batch {batch_id} not found for this API key"
+        
+        if not batch["done"]:
+            return "", f"⏳ Batch {batch_id} still running (status: {batch['status']}), check again later"
+        
+        # Format results per file
+        analyses = batch["results"]
+        file_names = batch["labels"] or [f"Meeting {i + 1}" for i in range(len(analyses))]
+        sections = []
+        for file_name, analysis in zip(file_names, analyses):
+            if not analysis:
+                sections.append(f"## 📄 {file_name}\n\n❌ Analysis failed")
+                continue
+            formatted_analysis = format_analysis_for_display(analysis)
+            sections.append(
+                f"## 📄 {file_name}\n\n{formatted_analysis['summary']}\n\n"
+                f"**🏷️ Main Topics**\n\n{formatted_analysis['topics']}\n\n"
+                f"**🔑 Keywords**\n\n{formatted_analysis['keywords']}"
+            )
+        
+        analyzed = sum(1 for analysis in analyses if analysis)
+        if batch["status"] != "completed":
+            return "\n\n---\n\n".join(sections), f"❌ Batch {batch_id} {batch['status']}: {analyzed}/{len(analyses)} meetings analyzed"
+        return "\n\n---\n\n".join(sections), f"✅ Batch completed: {analyzed}/{len(analyses)} meetings analyzed"
+    
+    except Exception as e:
+        logger.error(f"Error checking batch: {str(e)}")
+        return "", f"❌ Error: {str(e)}"
+
+
+def _log_dataset_save(future: Future) -> None:
+    """Log the outcome of a background dataset save."""
+    try:
+        if future.result():
+            logger.info("Meeting saved to HF Dataset")
+        else:
+            logger.warning("Saving to HF Dataset failed")
+    except Exception as e:
+        logger.warning(f"Saving to HF Dataset failed: {str(e)}")
+
+
+def _discard_late_pdf(future: Future) -> None:
+    """Delete a PDF generated after its request stopped waiting for it."""
+    from utils.pdf_generator import cleanup_temp_pdf
+    
+    try:
+        pdf_path = future.result()
+    except Exception as e:
+        logger.warning(f"Late PDF generation failed: {str(e)}")
+        return
+    
+    if pdf_path:
+        cleanup_temp_pdf(pdf_path)
+
+
+def cleanup_temp_files(request: gr.Request = None):
+    """
+    Clean up temporary files.
+    
+    Args:
+        request (gr.Request): Richiesta Gradio della sessione chiusa; se None
+            vengono eliminati i file di tutte le sessioni (es. allo shutdown)
+    """
+    with _temp_files_lock:
+        if request is not None:
+            file_paths = _temp_files.pop(request.session_hash, [])
+        else:
+            file_paths = [path for paths in _temp_files.values() for path in paths]
+            _temp_files.clear()
+    
+    for file_path in file_paths:
         if os.path.exists(file_path):
             try:
                 os.remove(file_path)
             except Exception as e:
                 logger.warning(f"Unable to delete {file_path}: {str(e)}")
-    _temp_files.clear()
 
 
 def create_interface():
@@ -268,6 +482,48 @@ def create_interface():
                     visible=True
                 )
         
+        # Batch mode
+        with gr.Accordion("📦 Batch Mode (OpenAI Batch API, 50% cheaper, results within 24h)", open=False):
+            with gr.Row():
+                with gr.Column(scale=1):
+                    # Input files
+                    batch_files_input = gr.File(
+                        label="📁 Upload Meeting Files",
+                        file_types=supported_extensions,
+                        file_count="multiple"
+                    )
+                    
+                    # Batch button
+                    batch_btn = gr.Button(
+                        "🗂️ Queue as batch",
+                        variant="secondary"
+                    )
+                    
+                    # Batch status
+                    batch_status_msg = gr.Textbox(
+                        label="📊 Batch Status",
+                        interactive=False
+                    )
+                    
+                    # Batch id (per recuperare i risultati anche piu' tardi)
+                    batch_id_input = gr.Textbox(
+                        label="🆔 Batch ID",
+                        placeholder="Filled in when the batch is queued"
+                    )
+                    
+                    # Check button
+                    check_batch_btn = gr.Button(
+                        "🔄 Check batch status",
+                        variant="secondary"
+                    )
+                
+                with gr.Column(scale=2):
+                    # Batch results
+                    batch_output = gr.Markdown(
+                        label="📝 Batch Results",
+                        value="The results of the batch will appear here..."
+                    )
+        
         # Footer
         gr.Markdown(
             """
@@ -284,11 +540,13 @@ def create_interface():
             - 📊 Topic and keyword extraction
             - 💾 Save to Hugging Face Datasets
             - 📄 Professional PDF generation
+            - 📦 Batch mode for many meetings at once
             
             **Notes:**
             - Audio files are automatically transcribed
             - Analysis is optimized for meetings
             - Data is saved only if you provide an HF token
+            - Batch results are kept for 7 days: check them with the Batch ID
             """
         )
         
@@ -297,10 +555,27 @@ def create_interface():
             fn=process_meeting,
             inputs=[file_input, api_key_input, hf_token_input],
             outputs=[summary_output, topics_output, keywords_output, pdf_download, status_msg],
-            show_progress=True
+            show_progress="minimal"
         )
         
-        # Cleanup al chiudere
+        # I listener batch non occupano il worker dell'analisi singola
+        batch_btn.click(
+            fn=process_batch,
+            inputs=[batch_files_input, api_key_input],
+            outputs=[batch_output, batch_status_msg, batch_id_input],
+            show_progress="minimal",
+            concurrency_limit=None
+        )
+        
+        check_batch_btn.click(
+            fn=check_batch,
+            inputs=[batch_id_input, api_key_input],
+            outputs=[batch_output, batch_status_msg],
+            show_progress="minimal",
+            concurrency_limit=None
+        )
+        
+        # Cleanup dei file della sessione al chiudere
         app.unload(cleanup_temp_files)
     
     return app
@@ -308,8 +583,16 @@ def create_interface():
 
 def main():
     """Main function."""
+    # Configurazione logging (una sola volta per tutta l'applicazione)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(name)s %(levelname)s %(message)s"
+    )
     logger.info("Starting Meeting Summarizer...")
     
+    # Remove remaining temporary files on graceful shutdown
+    atexit.register(cleanup_temp_files)
+    
     # Create interface
     app = create_interface()
     
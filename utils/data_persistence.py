@@ -3,27 +3,70 @@ Module for saving meeting data to Hugging Face Datasets.
 Manages permanent persistence of analysis results.
 """
 
-import json
+import atexit
+import functools
+import os
+import queue
+import secrets
+import threading
+import time
 import uuid
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 try:
-    from datasets import Dataset
-    from huggingface_hub import HfApi, login
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from huggingface_hub import HfApi
 except ImportError:
-    Dataset = None
+    pa = None
+    pq = None
     HfApi = None
-    login = None
 
-# Configurazione logging
+# datasets serve solo per rileggere i meeting: senza, il salvataggio funziona
+try:
+    from datasets import Dataset, load_dataset
+except ImportError:
+    Dataset = None
+    load_dataset = None
+
+# Logger del modulo
 import logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Nome del dataset su Hugging Face
 DATASET_NAME = "meeting-summarizer-data"
 
+# Cartella locale (privata) dei file parquet in attesa di upload, uno per meeting
+LOCAL_DATA_DIR = os.path.expanduser("~/.cache/meeting_summarizer/pending_meetings")
+
+# Pattern dei file parquet nel repository del dataset (data/YYYYMM/<id>.parquet)
+DATA_FILES = "data/*/*.parquet"
+
+# Coda degli upload verso HF Hub: piu' meeting per singolo commit
+SAVE_QUEUE_SIZE = 100
+SAVE_BATCH_SIZE = 10
+SAVE_BATCH_WAIT = 5  # secondi
+
+# Upload falliti: nuovi tentativi con attesa crescente, poi lo shard viene eliminato
+SAVE_MAX_RETRIES = 3
+SAVE_RETRY_DELAY = 5  # secondi, raddoppia a ogni tentativo
+
+_SAVE_Q: "queue.Queue" = queue.Queue(maxsize=SAVE_QUEUE_SIZE)
+
+# Schema dei record: topics e keywords come liste native
+if pa is not None:
+    _SCHEMA = pa.schema([
+        ("id", pa.string()),
+        ("file_name", pa.string()),
+        ("meeting_date", pa.string()),
+        ("transcription", pa.string()),
+        ("summary", pa.string()),
+        ("topics", pa.list_(pa.string())),
+        ("keywords", pa.list_(pa.string())),
+        ("created_at", pa.string())
+    ])
+
 
 def save_meeting_to_dataset(meeting_data: Dict, hf_token: Optional[str] = None) -> bool:
     """
@@ -40,52 +83,39 @@ def save_meeting_to_dataset(meeting_data: Dict, hf_token: Optional[str] = None)
         logger.error("Meeting data not provided")
         return False
     
-    if Dataset is None:
-        logger.error("datasets not installed. Install with: pip install datasets")
+    if pq is None or HfApi is None:
+        logger.error("pyarrow or huggingface_hub not installed. Install with: pip install pyarrow huggingface-hub")
+        return False
+    
+    # Shards are only staged for upload, nothing is kept without a token
+    if not hf_token:
+        logger.warning("Hugging Face token not provided, meeting not saved")
         return False
     
     try:
-        # Authentication if token provided
-        if hf_token:
-            try:
-                login(token=hf_token)
-                logger.info("Hugging Face authentication completed")
-            except Exception as e:
-                logger.warning(f"Error in HF authentication: {str(e)}")
-                logger.info("Continuing without authentication...")
-        
         # Prepare data for saving
         meeting_record = _prepare_meeting_record(meeting_data)
         
-        # Create or load dataset
-        dataset = _get_or_create_dataset()
-        
-        # Add new record
-        if dataset is None:
-            logger.error("Unable to create or load dataset")
-            return False
+        # Each meeting is written to its own parquet shard: no download
+        # or rewrite of the existing data
+        shard_path = _get_shard_path(meeting_record)
+        local_path = os.path.join(LOCAL_DATA_DIR, shard_path)
         
-        # Convert dataset to list to add record
-        records = list(dataset)
-        records.append(meeting_record)
+        # Transcripts are private: directories readable only by the owner
+        os.makedirs(LOCAL_DATA_DIR, mode=0o700, exist_ok=True)
+        os.chmod(LOCAL_DATA_DIR, 0o700)
+        os.makedirs(os.path.dirname(local_path), mode=0o700, exist_ok=True)
+        pq.write_table(pa.Table.from_pylist([meeting_record], schema=_SCHEMA), local_path)
         
-        # Create new dataset with added record
-        new_dataset = Dataset.from_list(records)
+        # Queue shard for upload to Hugging Face Hub
+        try:
+            _SAVE_Q.put_nowait((shard_path, hf_token, 0))
+        except queue.Full:
+            logger.warning("HF Hub upload queue is full, meeting not pushed")
+            _remove_shards([shard_path])
+            return False
         
-        # Push to Hugging Face Hub (if authenticated)
-        if hf_token:
-            try:
-                new_dataset.push_to_hub(
-                    DATASET_NAME,
-                    private=True,
-                    token=hf_token
-                )
-                logger.info(f"Dataset updated on Hugging Face Hub: {DATASET_NAME}")
-            except Exception as e:
-                logger.warning(f"Unable to push to HF Hub: {str(e)}")
-                logger.info("Data saved locally")
-        
-        logger.info("Meeting saved successfully to dataset")
+        logger.info("Meeting queued for upload to dataset")
         return True
         
     except Exception as e:
@@ -106,89 +136,236 @@ def _prepare_meeting_record(meeting_data: Dict) -> Dict:
     current_time = datetime.now()
     
     return {
-        "id": str(uuid.uuid4()),
+        "id": str(_uuid7()),
         "file_name": meeting_data.get("file_name", "unknown"),
         "meeting_date": current_time.strftime("%Y-%m-%d"),
         "transcription": meeting_data.get("transcription", ""),
         "summary": meeting_data.get("summary", ""),
-        "topics": json.dumps(meeting_data.get("topics", [])),
-        "keywords": json.dumps(meeting_data.get("keywords", [])),
+        "topics": [str(topic) for topic in meeting_data.get("topics", [])],
+        "keywords": [str(keyword) for keyword in meeting_data.get("keywords", [])],
         "created_at": current_time.isoformat()
     }
 
 
-def _get_or_create_dataset() -> Optional[Dataset]:
+def _uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID version 7 (RFC 9562).
+    
+    The first 48 bits are the Unix timestamp in milliseconds, so sorting
+    ids also sorts meetings by creation time.
+    
+    Returns:
+        uuid.UUID: New UUIDv7
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFFFFFFFFFF) << 80 | int.from_bytes(secrets.token_bytes(10), "big")
+    
+    # Version (4 bits) and variant (2 bits)
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    
+    return uuid.UUID(int=value)
+
+
+def _get_shard_path(meeting_record: Dict) -> str:
     """
-    Create or load Hugging Face dataset.
+    Return the relative path of the parquet shard of a meeting.
     
+    Args:
+        meeting_record (Dict): Record built by _prepare_meeting_record
+        
     Returns:
-        Optional[Dataset]: Dataset or None if error
+        str: Path in the form "YYYYMM/<id>.parquet"
     """
-    try:
-        # Try to load existing dataset
+    month = meeting_record["created_at"][:7].replace("-", "")
+    return f"{month}/{meeting_record['id']}.parquet"
+
+
+@functools.lru_cache(maxsize=8)
+def _get_repo_id(hf_token: str) -> str:
+    """
+    Return the full id of the dataset repository, creating it if needed.
+    
+    Args:
+        hf_token (str): Hugging Face token
+        
+    Returns:
+        str: Repository id in the form "<user>/<DATASET_NAME>"
+    """
+    repo_url = HfApi(token=hf_token).create_repo(
+        DATASET_NAME,
+        repo_type="dataset",
+        private=True,
+        exist_ok=True
+    )
+    return repo_url.repo_id
+
+
+def flush_pending_saves() -> None:
+    """Wait until all queued meetings have been uploaded to HF Hub."""
+    _SAVE_Q.join()
+
+
+def _save_worker() -> None:
+    """Drain the upload queue, committing up to SAVE_BATCH_SIZE meetings at a time."""
+    while True:
+        batch = [_SAVE_Q.get()]
+        deadline = time.monotonic() + SAVE_BATCH_WAIT
+        
+        while len(batch) < SAVE_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_SAVE_Q.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
         try:
-            dataset = Dataset.from_hub(DATASET_NAME)
-            logger.info(f"Existing dataset loaded: {DATASET_NAME}")
-            return dataset
-        except Exception:
-            logger.info(f"Dataset {DATASET_NAME} not found, creating new dataset...")
-        
-        # Create new empty dataset
-        empty_dataset = Dataset.from_dict({
-            "id": [],
-            "file_name": [],
-            "meeting_date": [],
-            "transcription": [],
-            "summary": [],
-            "topics": [],
-            "keywords": [],
-            "created_at": []
-        })
-        
-        logger.info(f"New dataset created: {DATASET_NAME}")
-        return empty_dataset
+            _upload_shards(batch)
+        finally:
+            for _ in batch:
+                _SAVE_Q.task_done()
+
+
+def _upload_shards(batch: List[Tuple[str, str, int]]) -> None:
+    """
+    Upload a batch of parquet shards with one commit per token.
+    
+    Shards of a failed commit are queued again up to SAVE_MAX_RETRIES times,
+    then deleted (the meeting is not saved).
+    
+    Args:
+        batch (List[Tuple[str, str, int]]): (shard_path, hf_token, attempt) entries
+    """
+    entries_by_token: Dict[str, List[Tuple[str, int]]] = {}
+    for shard_path, hf_token, attempt in batch:
+        entries_by_token.setdefault(hf_token, []).append((shard_path, attempt))
+    
+    for hf_token, entries in entries_by_token.items():
+        shard_paths = [shard_path for shard_path, _ in entries]
         
-    except Exception as e:
-        logger.error(f"Error in creating/loading dataset: {str(e)}")
-        return None
+        try:
+            repo_id = _get_repo_id(hf_token)
+            HfApi(token=hf_token).upload_folder(
+                folder_path=LOCAL_DATA_DIR,
+                path_in_repo="data",
+                repo_id=repo_id,
+                repo_type="dataset",
+                allow_patterns=shard_paths,
+                commit_message=f"Add {len(shard_paths)} meeting(s)"
+            )
+            logger.info(f"Dataset updated on Hugging Face Hub: {repo_id} ({len(shard_paths)} meetings)")
+        except Exception as e:
+            logger.warning(f"Unable to push to HF Hub: {str(e)}")
+            _retry_shards(entries, hf_token)
+            continue
+        
+        # Uploaded shards are no longer needed on disk
+        _remove_shards(shard_paths)
+
+
+def _retry_shards(entries: List[Tuple[str, int]], hf_token: str) -> None:
+    """
+    Queue failed shards again with exponential backoff, or drop them after SAVE_MAX_RETRIES.
+    
+    Args:
+        entries (List[Tuple[str, int]]): (shard_path, attempt) of the failed commit
+        hf_token (str): Hugging Face token
+    """
+    attempt = max(attempt for _, attempt in entries)
+    if attempt < SAVE_MAX_RETRIES:
+        time.sleep(SAVE_RETRY_DELAY * 2 ** attempt)
+    
+    for shard_path, attempt in entries:
+        if attempt < SAVE_MAX_RETRIES:
+            try:
+                _SAVE_Q.put_nowait((shard_path, hf_token, attempt + 1))
+                continue
+            except queue.Full:
+                pass
+        
+        logger.error(f"Meeting not saved to HF Hub after {attempt + 1} attempts: {shard_path}")
+        _remove_shards([shard_path])
 
 
-def load_meetings_from_dataset(hf_token: Optional[str] = None) -> Optional[list]:
+def _remove_shards(shard_paths: List[str]) -> None:
+    """Delete local parquet shards (paths relative to LOCAL_DATA_DIR)."""
+    for shard_path in shard_paths:
+        try:
+            os.remove(os.path.join(LOCAL_DATA_DIR, shard_path))
+        except OSError as e:
+            logger.warning(f"Unable to remove local shard {shard_path}: {str(e)}")
+
+
+# Avvio del worker di upload e flush della coda all'uscita
+if HfApi is not None:
+    threading.Thread(target=_save_worker, name="hf-dataset-upload", daemon=True).start()
+    atexit.register(flush_pending_saves)
+
+
+def load_meetings_from_dataset(hf_token: Optional[str] = None,
+                               columns: Optional[List[str]] = None) -> Optional["Dataset"]:
     """
     Load all meetings from dataset.
     
+    The returned Dataset is backed by Arrow: rows are decoded only when
+    accessed. Call .to_list() if a list of dicts is really needed.
+    
     Args:
         hf_token (Optional[str]): Hugging Face token
+        columns (Optional[List[str]]): Fields to keep (all if None)
         
     Returns:
-        Optional[list]: List of meetings or None if error
+        Optional[Dataset]: Meetings dataset or None if error
     """
-    if Dataset is None:
+    if load_dataset is None:
         logger.error("datasets not installed")
         return None
     
     try:
-        # Authentication if token provided
-        if hf_token:
-            try:
-                login(token=hf_token)
-            except Exception as e:
-                logger.warning(f"Error in HF authentication: {str(e)}")
+        repo_id = _get_repo_id(hf_token) if hf_token else DATASET_NAME
         
-        # Load dataset
-        dataset = Dataset.from_hub(DATASET_NAME)
+        # Load dataset (all parquet shards)
+        dataset = load_dataset(
+            repo_id,
+            data_files=DATA_FILES,
+            split="train",
+            token=hf_token or None
+        )
         
-        # Convert to list
-        meetings = list(dataset)
+        # Column projection on the Arrow table, no rows are decoded
+        if columns:
+            dataset = dataset.select_columns(columns)
         
-        logger.info(f"Loaded {len(meetings)} meetings from dataset")
-        return meetings
+        logger.info(f"Loaded {dataset.num_rows} meetings from dataset")
+        return dataset
         
     except Exception as e:
         logger.error(f"Error loading meetings: {str(e)}")
         return None
 
 
+def load_meetings_stream(hf_token: Optional[str] = None,
+                         columns: Optional[List[str]] = None) -> Iterator[Dict]:
+    """
+    Iterate over the meetings of the dataset one row at a time.
+    
+    Args:
+        hf_token (Optional[str]): Hugging Face token
+        columns (Optional[List[str]]): Fields to keep (all if None)
+        
+    Yields:
+        Dict: One meeting record
+    """
+    dataset = load_meetings_from_dataset(hf_token, columns)
+    if dataset is None:
+        return
+    
+    for row in dataset:
+        yield row
+
+
 def get_dataset_info() -> Dict:
     """
     Return dataset information.
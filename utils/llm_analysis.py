@@ -3,19 +3,135 @@ Module for analyzing meeting text using GPT-4o-mini.
 Extracts summary, topics and keywords from text.
 """
 
+import asyncio
+import functools
+import hashlib
 import json
 import logging
-from typing import Dict, List, Optional
+import re
+import time
+import uuid
+from typing import Dict, Iterator, List, Optional, Tuple
 
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
 except ImportError:
     OpenAI = None
+    AsyncOpenAI = None
 
-# Configurazione logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from utils.llm_cache import (
+    is_cache_available,
+    make_cache_key,
+    get_cached_analysis,
+    embed_text,
+    find_similar_analysis,
+    store_analysis,
+    store_batch_state,
+    get_batch_state
+)
+
+# Logger del modulo
 logger = logging.getLogger(__name__)
 
+# Modello usato per l'analisi
+MODEL = "gpt-4o-mini"
+
+# Versione del prompt: incrementare ad ogni modifica per invalidare la cache
+PROMPT_VERSION = "3"
+
+# Fixed system prompt: the transcript goes last so the prefix can be reused
+# by OpenAI's server-side prompt caching
+SYSTEM_PROMPT = """You are an expert assistant in meeting analysis. Always provide responses in valid JSON format.
+
+Analyze the meeting text provided by the user and provide a response in JSON format with the following keys:
+
+1. "summary": A comprehensive and detailed summary of the meeting (minimum 200 words)
+2. "topics": A list of 5-8 main topics discussed in the meeting
+3. "keywords": A list of 10-15 relevant keywords
+
+Respond ONLY with the requested JSON, without any additional text."""
+
+# JSON schema imposed at decode time (structured outputs)
+MEETING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "topics": {
+            "type": "array",
+            "items": {"type": "string"},
+            "minItems": 5,
+            "maxItems": 8
+        },
+        "keywords": {
+            "type": "array",
+            "items": {"type": "string"},
+            "minItems": 10,
+            "maxItems": 15
+        }
+    },
+    "required": ["summary", "topics", "keywords"],
+    "additionalProperties": False
+}
+
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "meeting_analysis", "schema": MEETING_SCHEMA, "strict": True}
+}
+
+# Long transcripts are split into overlapping chunks summarized in parallel
+CHUNK_TOKENS = 6000
+CHUNK_OVERLAP_TOKENS = 400
+MAX_CONCURRENT_CHUNKS = 8
+
+CHUNK_SYSTEM_PROMPT = """You are an expert assistant in meeting analysis.
+
+The user provides one section of a longer meeting transcript. Write a detailed summary of this section, keeping decisions, action items, names and figures, and list the topics and keywords it covers."""
+
+# Limite di token del testo in input (contesto del modello meno il budget di output)
+MAX_INPUT_TOKENS = 120_000
+
+# Stima usata quando tiktoken non è disponibile
+CHARS_PER_TOKEN = 4
+
+# Encoding tiktoken (caricato al primo utilizzo)
+_encoding = None
+_encoding_checked = False
+
+# Batch API: attesa massima e intervalli di polling (secondi)
+BATCH_TIMEOUT = 24 * 3600
+BATCH_POLL_INITIAL = 5
+BATCH_POLL_MAX = 300
+BATCH_FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# JSON veloce (orjson) se disponibile, altrimenti libreria standard
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+# Parser per la risposta JSON in streaming
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE_RE = re.compile(r"\s*")
+
 
 def analyze_meeting(text: str, api_key: str) -> Optional[Dict]:
     """
@@ -26,92 +142,587 @@ def analyze_meeting(text: str, api_key: str) -> Optional[Dict]:
         api_key (str): OpenAI API key
         
     Returns:
-        Optional[Dict]: Dictionary with summary, topics, keywords or None if error
+        Optional[Dict]: Dictionary with summary, topics, keywords and
+        token_count (tokens analyzed) or None if error
+    """
+    result = None
+    for result in analyze_meeting_stream(text, api_key):
+        pass
+    return result
+
+
+def analyze_meeting_stream(text: str, api_key: str) -> Iterator[Optional[Dict]]:
+    """
+    Analyze meeting text using GPT-4o-mini, streaming partial results.
+    
+    Args:
+        text (str): Meeting text to analyze
+        api_key (str): OpenAI API key
+        
+    Yields:
+        Optional[Dict]: Partial analysis each time summary, a topic or a keyword
+        completes. The last item is the complete analysis with token_count,
+        or None if error.
     """
     if not text or not text.strip():
         logger.error("Empty text provided for analysis")
-        return None
+        yield None
+        return
     
     if not api_key:
         logger.error("OpenAI API key not provided")
-        return None
+        yield None
+        return
     
     if OpenAI is None:
         logger.error("OpenAI not installed. Install with: pip install openai")
-        return None
+        yield None
+        return
     
     try:
-        # Initialize OpenAI client
-        client = OpenAI(api_key=api_key)
+        # Reuse pooled OpenAI client
+        client = _get_client(api_key)
         
-        # Structured prompt for analysis
-        prompt = f"""
-Analyze the following meeting text and provide a response in JSON format with the following keys:
-
-1. "summary": A comprehensive and detailed summary of the meeting (minimum 200 words)
-2. "topics": A list of 5-8 main topics discussed in the meeting
-3. "keywords": A list of 10-15 relevant keywords
-
-Meeting text:
-{text}
+        # Single tokenization pass, reused for truncation, chunking and token count
+        text, tokens, token_count = _truncate_to_budget(text)
+        
+        # Check cache before calling the model
+        namespace = _cache_namespace(api_key)
+        cache_key = make_cache_key(text, namespace)
+        cached = get_cached_analysis(cache_key)
+        if cached is not None:
+            logger.info("Analysis found in cache")
+            yield {**cached, "token_count": token_count}
+            return
+        
+        embedding = None
+        if is_cache_available():
+            embedding = embed_text(client, text)
+            if embedding is not None:
+                similar = find_similar_analysis(embedding, namespace, token_count)
+                if similar is not None:
+                    store_analysis(cache_key, similar, namespace)
+                    yield {**similar, "token_count": token_count}
+                    return
 
-Respond ONLY with the requested JSON, without any additional text.
-"""
+        # Map-reduce for long transcripts: the final call only sees chunk summaries
+        chunks = _split_into_chunks(text, tokens)
+        if len(chunks) > 1:
+            logger.info(f"Long transcript: summarizing {len(chunks)} chunks in parallel...")
+            chunk_summaries = asyncio.run(_summarize_chunks(api_key, chunks))
+            sections = "\n\n".join(
+                f"Section {i}:\n{summary}" for i, summary in enumerate(chunk_summaries, 1)
+            )
+            user_content = f"Meeting text (summaries of consecutive sections of the meeting):\n{sections}"
+        else:
+            user_content = f"Meeting text:\n{text}"
 
         logger.info("Sending request to GPT-4o-mini...")
         
-        # API call
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an expert assistant in meeting analysis. Always provide responses in valid JSON format."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=2000,
-            temperature=0.3
-        )
+        # Streaming API call
+        stream = client.chat.completions.create(**_analysis_request(user_content), stream=True)
         
-        # Extract response content
-        content = response.choices[0].message.content.strip()
+        # Accumulate response and emit fields as soon as they are closed
+        parts = []
+        partial = {}
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            parts.append(delta)
+            
+            # A string or list can only close on a quote or bracket
+            if '"' not in delta and "]" not in delta:
+                continue
+            
+            current = _parse_partial_json("".join(parts))
+            if current != partial:
+                partial = current
+                yield partial
         
-        # Clean content from any markdown or extra text
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.endswith("```"):
-            content = content[:-3]
+        # Extract response content (schema-conformant JSON)
+        content = "".join(parts)
         
         # Parse JSON
         try:
-            result = json.loads(content)
-            
-            # Structure validation
-            required_keys = ["summary", "topics", "keywords"]
-            if not all(key in result for key in required_keys):
-                logger.error("Invalid JSON structure: missing keys")
-                return None
+            result = _json_loads(content)
             
-            # Type validation
-            if not isinstance(result["summary"], str):
-                logger.error("Summary must be a string")
-                return None
-            if not isinstance(result["topics"], list):
-                logger.error("Topics must be a list")
-                return None
-            if not isinstance(result["keywords"], list):
-                logger.error("Keywords must be a list")
-                return None
+            result["topics"] = _deduplicate(result["topics"])
+            result["keywords"] = _deduplicate(result["keywords"])
             
             logger.info("Analysis completed successfully")
-            return result
+            store_analysis(cache_key, result, namespace, embedding, token_count)
+            yield {**result, "token_count": token_count}
             
         except json.JSONDecodeError as e:
             logger.error(f"JSON parsing error: {str(e)}")
             logger.error(f"Received content: {content}")
-            return None
+            yield None
         
     except Exception as e:
         logger.error(f"Error during meeting analysis: {str(e)}")
+        yield None
+
+
+def submit_meetings_batch(texts: List[str], api_key: str, labels: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Submit several meetings as a single OpenAI Batch API job, without waiting.
+    
+    Batch jobs cost half of the online requests but may take up to 24 hours,
+    so this is meant for bulk, non-urgent analysis. Texts are analyzed in a
+    single call each (no map-reduce), truncated to MAX_INPUT_TOKENS.
+    The pending batch is persisted in the analysis cache: collect the
+    results later with get_batch_results.
+    
+    Args:
+        texts (List[str]): Meeting texts to analyze
+        api_key (str): OpenAI API key
+        labels (Optional[List[str]]): Names of the meetings (e.g. file names),
+            returned together with the results
+    
+    Returns:
+        Optional[str]: Batch id or None if the batch could not be submitted
+    """
+    if not api_key:
+        logger.error("OpenAI API key not provided")
+        return None
+    
+    if OpenAI is None:
+        logger.error("OpenAI not installed. Install with: pip install openai")
+        return None
+    
+    try:
+        client = _get_client(api_key)
+        namespace = _cache_namespace(api_key)
+        results = [None] * len(texts)
+        
+        # Prepare one request per text not already in cache
+        pending = {}
+        lines = []
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            
+            text, _, token_count = _truncate_to_budget(text)
+            cache_key = make_cache_key(text, namespace)
+            cached = get_cached_analysis(cache_key)
+            if cached is not None:
+                results[i] = {**cached, "token_count": token_count}
+                continue
+            
+            pending[str(i)] = [cache_key, token_count]
+            lines.append(_json_dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": _analysis_request(f"Meeting text:\n{text}")
+            }))
+        
+        state = {
+            "namespace": namespace,
+            "results": results,
+            "pending": pending,
+            "labels": list(labels or []),
+            "status": "completed"
+        }
+        
+        if not lines:
+            # Tutto in cache: nessun job da inviare
+            batch_id = f"local-{uuid.uuid4().hex}"
+            store_batch_state(batch_id, state)
+            return batch_id
+        
+        # Upload requests and submit the batch
+        batch_file = client.files.create(
+            file=("meetings_batch.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        state["status"] = batch.status
+        store_batch_state(batch.id, state)
+        logger.info(f"Batch {batch.id} submitted with {len(lines)} meetings")
+        return batch.id
+    
+    except Exception as e:
+        logger.error(f"Error submitting batch analysis: {str(e)}")
+        return None
+
+
+def get_batch_results(batch_id: str, api_key: str) -> Optional[Dict]:
+    """
+    Check a batch submitted with submit_meetings_batch and collect its results.
+    
+    Args:
+        batch_id (str): Batch id returned by submit_meetings_batch
+        api_key (str): OpenAI API key used to submit the batch
+    
+    Returns:
+        Optional[Dict]: Dictionary with:
+            - status: Batch status ("completed", "in_progress", "failed", ...)
+            - done: True once the batch reached a final status
+            - results: One analysis per text, in the submission order
+              (None for texts not analyzed, or not analyzed yet)
+            - labels: Names of the meetings given at submission
+        None if the batch is unknown or was submitted with another API key
+    """
+    if not api_key:
+        logger.error("OpenAI API key not provided")
+        return None
+    
+    state = get_batch_state(batch_id)
+    if state is None:
+        logger.error(f"Unknown batch: {batch_id}")
         return None
+    
+    if state["namespace"] != _cache_namespace(api_key):
+        logger.error(f"Batch {batch_id} was not submitted with this API key")
+        return None
+    
+    try:
+        if state["status"] not in BATCH_FINAL_STATUSES:
+            client = _get_client(api_key)
+            batch = client.batches.retrieve(batch_id)
+            
+            if batch.status == "completed" and batch.output_file_id:
+                _collect_batch_output(client, batch.output_file_id, state)
+                logger.info(f"Batch {batch_id} completed")
+            elif batch.status in BATCH_FINAL_STATUSES:
+                logger.error(f"Batch {batch_id} ended with status: {batch.status}")
+            
+            if batch.status != state["status"]:
+                state["status"] = batch.status
+                store_batch_state(batch_id, state)
+    
+    except Exception as e:
+        logger.error(f"Error checking batch {batch_id}: {str(e)}")
+        return None
+    
+    return {
+        "status": state["status"],
+        "done": state["status"] in BATCH_FINAL_STATUSES,
+        "results": state["results"],
+        "labels": state["labels"]
+    }
+
+
+def analyze_meetings_batch(texts: List[str], api_key: str, timeout: float = BATCH_TIMEOUT) -> List[Optional[Dict]]:
+    """
+    Analyze several meetings with a single OpenAI Batch API job, waiting for it.
+    
+    Blocks until the batch is done (up to 24 hours): in the UI use
+    submit_meetings_batch and get_batch_results instead.
+    
+    Args:
+        texts (List[str]): Meeting texts to analyze
+        api_key (str): OpenAI API key
+        timeout (float): Maximum time to wait for the batch (seconds)
+    
+    Returns:
+        List[Optional[Dict]]: One analysis per text, in the same order
+        (None for texts that could not be analyzed)
+    """
+    batch_id = submit_meetings_batch(texts, api_key)
+    if batch_id is None:
+        return [None] * len(texts)
+    
+    # Poll with exponential backoff
+    delay = BATCH_POLL_INITIAL
+    deadline = time.monotonic() + timeout
+    while True:
+        batch = get_batch_results(batch_id, api_key)
+        if batch is None:
+            return [None] * len(texts)
+        if batch["done"]:
+            return batch["results"]
+        if time.monotonic() >= deadline:
+            logger.error(f"Batch {batch_id} not completed within {timeout}s (status: {batch['status']})")
+            return batch["results"]
+        time.sleep(delay)
+        delay = min(delay * 2, BATCH_POLL_MAX)
+
+
+def _collect_batch_output(client, output_file_id: str, state: Dict) -> None:
+    """
+    Read the output file of a completed batch into its state (by custom_id).
+    
+    Args:
+        client: OpenAI client
+        output_file_id (str): Id of the batch output file
+        state (Dict): Batch state, updated in place
+    """
+    pending = state["pending"]
+    results = state["results"]
+    
+    output = client.files.content(output_file_id).text
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        item = _json_loads(line)
+        custom_id = item.get("custom_id")
+        if custom_id not in pending:
+            continue
+        
+        response = item.get("response") or {}
+        if response.get("status_code") != 200:
+            logger.warning(f"Batch request {custom_id} failed: {item.get('error')}")
+            continue
+        
+        try:
+            content = response["body"]["choices"][0]["message"]["content"]
+            result = _json_loads(content)
+        except (KeyError, IndexError, TypeError, json.JSONDecodeError) as e:
+            logger.warning(f"Invalid response for batch request {custom_id}: {str(e)}")
+            continue
+        
+        result["topics"] = _deduplicate(result["topics"])
+        result["keywords"] = _deduplicate(result["keywords"])
+        
+        cache_key, token_count = pending[custom_id]
+        store_analysis(cache_key, result, state["namespace"])
+        results[int(custom_id)] = {**result, "token_count": token_count}
+
+
+def _cache_namespace(api_key: str) -> str:
+    """
+    Return the cache namespace: model, prompt version and a hash of the API key.
+    
+    Cached analyses are never shared between different API keys (users).
+    """
+    key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    return f"{MODEL}:{PROMPT_VERSION}:{key_hash}"
+
+
+def _analysis_request(user_content: str) -> Dict:
+    """
+    Build the chat completion parameters of the final analysis call.
+    
+    Args:
+        user_content (str): User message with the meeting text
+        
+    Returns:
+        Dict: Parameters for chat.completions.create (also used as batch body)
+    """
+    return {
+        "model": MODEL,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_content}
+        ],
+        "max_tokens": 2000,
+        "temperature": 0.3,
+        "response_format": RESPONSE_FORMAT
+    }
+
+
+def _truncate_to_budget(text: str) -> Tuple[str, Optional[List[int]], int]:
+    """
+    Tokenize text once and truncate it to MAX_INPUT_TOKENS.
+    
+    Args:
+        text (str): Meeting text
+        
+    Returns:
+        Tuple[str, Optional[List[int]], int]: (text, tokens or None if tiktoken
+        is not available, token count)
+    """
+    encoding = _get_encoding()
+    tokens = encoding.encode(text) if encoding is not None else None
+    token_count = len(tokens) if tokens is not None else len(text) // CHARS_PER_TOKEN
+    
+    if token_count > MAX_INPUT_TOKENS:
+        logger.warning(f"Text too long ({token_count} tokens), truncating to {MAX_INPUT_TOKENS} tokens")
+        if tokens is not None:
+            tokens = tokens[:MAX_INPUT_TOKENS]
+            text = encoding.decode(tokens)
+        else:
+            text = text[:MAX_INPUT_TOKENS * CHARS_PER_TOKEN]
+        token_count = MAX_INPUT_TOKENS
+    
+    return text, tokens, token_count
+
+
+@functools.lru_cache(maxsize=8)
+def _get_client(api_key: str):
+    """
+    Return the OpenAI client for an API key, reused across requests so that
+    the TCP/TLS connection stays open between meetings.
+    
+    Args:
+        api_key (str): OpenAI API key
+        
+    Returns:
+        OpenAI: Client with a keep-alive connection pool
+    """
+    if httpx is None:
+        return OpenAI(api_key=api_key)
+    
+    limits = httpx.Limits(max_keepalive_connections=10)
+    try:
+        http_client = httpx.Client(http2=True, limits=limits)
+    except ImportError:
+        # h2 not installed: keep-alive over HTTP/1.1
+        http_client = httpx.Client(limits=limits)
+    
+    return OpenAI(api_key=api_key, http_client=http_client)
+
+
+def _get_encoding():
+    """Load the tiktoken encoding of the model on first use."""
+    global _encoding, _encoding_checked
+    
+    # Load attempted only once: on failure the character estimate is used from then on
+    if not _encoding_checked and tiktoken is not None:
+        try:
+            _encoding = tiktoken.encoding_for_model(MODEL)
+        except Exception as e:
+            logger.warning(f"Unable to load tiktoken encoding, using character estimate: {str(e)}")
+        _encoding_checked = True
+    
+    return _encoding
+
+
+def _split_into_chunks(text: str, tokens: Optional[List[int]]) -> List[str]:
+    """
+    Split text into overlapping chunks of at most CHUNK_TOKENS tokens.
+    
+    Args:
+        text (str): Meeting text
+        tokens (Optional[List[int]]): Tokens of text, or None if tiktoken is not available
+        
+    Returns:
+        List[str]: Chunks of text (a single chunk if the text is short enough)
+    """
+    if tokens is None:
+        size, overlap = CHUNK_TOKENS * CHARS_PER_TOKEN, CHUNK_OVERLAP_TOKENS * CHARS_PER_TOKEN
+        if len(text) <= size:
+            return [text]
+        return [text[start:start + size] for start in range(0, len(text) - overlap, size - overlap)]
+    
+    if len(tokens) <= CHUNK_TOKENS:
+        return [text]
+    
+    encoding = _get_encoding()
+    step = CHUNK_TOKENS - CHUNK_OVERLAP_TOKENS
+    return [
+        encoding.decode(tokens[start:start + CHUNK_TOKENS])
+        for start in range(0, len(tokens) - CHUNK_OVERLAP_TOKENS, step)
+    ]
+
+
+async def _summarize_chunks(api_key: str, chunks: List[str]) -> List[str]:
+    """
+    Summarize all chunks concurrently.
+    
+    Args:
+        api_key (str): OpenAI API key
+        chunks (List[str]): Chunks of meeting text
+        
+    Returns:
+        List[str]: Summaries in the same order as chunks
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHUNKS)
+    async with AsyncOpenAI(api_key=api_key) as client:
+        return await asyncio.gather(*[_summarize_chunk(client, chunk, semaphore) for chunk in chunks])
+
+
+async def _summarize_chunk(client, chunk: str, semaphore: asyncio.Semaphore) -> str:
+    """Summarize a single chunk of meeting text."""
+    async with semaphore:
+        response = await client.chat.completions.create(
+            model=MODEL,
+            messages=[
+                {"role": "system", "content": CHUNK_SYSTEM_PROMPT},
+                {"role": "user", "content": chunk}
+            ],
+            max_tokens=1000,
+            temperature=0.3
+        )
+    return response.choices[0].message.content.strip()
+
+
+def _deduplicate(items: List) -> List:
+    """Remove case-insensitive duplicates, keeping the first occurrence."""
+    seen = set()
+    unique = []
+    for item in items:
+        key = str(item).strip().lower()
+        if key not in seen:
+            seen.add(key)
+            unique.append(item)
+    return unique
+
+
+def _parse_partial_json(buffer: str) -> Dict:
+    """
+    Parse the completed fields of a JSON object that is still being received.
+    
+    Args:
+        buffer (str): JSON text received so far
+        
+    Returns:
+        Dict: Fields whose value is complete; a list still open contains
+        only its completed items
+    """
+    result = {}
+    
+    index = buffer.find("{")
+    if index < 0:
+        return result
+    index += 1
+    
+    while True:
+        index = _skip_whitespace(buffer, index)
+        try:
+            key, index = _JSON_DECODER.raw_decode(buffer, index)
+        except json.JSONDecodeError:
+            return result
+        
+        index = _skip_whitespace(buffer, index)
+        if buffer[index:index + 1] != ":":
+            return result
+        index = _skip_whitespace(buffer, index + 1)
+        
+        try:
+            value, index = _JSON_DECODER.raw_decode(buffer, index)
+        except json.JSONDecodeError:
+            if buffer[index:index + 1] == "[":
+                result[key] = _parse_partial_list(buffer, index + 1)
+            return result
+        result[key] = value
+        
+        index = _skip_whitespace(buffer, index)
+        if buffer[index:index + 1] != ",":
+            return result
+        index += 1
+
+
+def _parse_partial_list(buffer: str, index: int) -> List:
+    """Parse the completed items of a JSON list starting at index."""
+    items = []
+    
+    while True:
+        index = _skip_whitespace(buffer, index)
+        try:
+            item, index = _JSON_DECODER.raw_decode(buffer, index)
+        except json.JSONDecodeError:
+            return items
+        items.append(item)
+        
+        index = _skip_whitespace(buffer, index)
+        if buffer[index:index + 1] != ",":
+            return items
+        index += 1
+
+
+def _skip_whitespace(buffer: str, index: int) -> int:
+    """Return the index of the first non-whitespace character from index."""
+    return _WHITESPACE_RE.match(buffer, index).end()
 
 
 def format_analysis_for_display(analysis: Dict) -> Dict[str, str]:
@@ -131,11 +742,14 @@ def format_analysis_for_display(analysis: Dict) -> Dict[str, str]:
             "keywords": "Error in analysis"
         }
     
+    topics = analysis.get("topics")
+    keywords = analysis.get("keywords")
+    
     # Format topics as markdown list
-    topics_md = "\n".join([f"- {topic}" for topic in analysis.get("topics", [])])
+    topics_md = "- " + "\n- ".join(map(str, topics)) if topics else ""
     
     # Format keywords as markdown list
-    keywords_md = "\n".join([f"- {keyword}" for keyword in analysis.get("keywords", [])])
+    keywords_md = "- " + "\n- ".join(map(str, keywords)) if keywords else ""
     
     return {
         "summary": analysis.get("summary", "Summary not available"),
@@ -0,0 +1,275 @@
+"""
+Module for caching meeting analysis results.
+Provides an exact-match cache and a semantic cache based on text embeddings.
+"""
+
+import hashlib
+import logging
+import os
+from typing import Dict, List, Optional
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Logger del modulo
+logger = logging.getLogger(__name__)
+
+# Cartella della cache su disco
+CACHE_DIR = os.path.expanduser("~/.cache/meeting_summarizer")
+
+# Configurazione della cache semantica
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_INPUT_CHARS = 8000
+EMBEDDING_SAMPLES = 8
+SIMILARITY_THRESHOLD = 0.97
+
+# Scarto massimo di lunghezza (in token) tra due testi considerati equivalenti
+TOKEN_COUNT_TOLERANCE = 0.05
+
+# Batch API in attesa: conservati per una settimana (la finestra di OpenAI e' 24h)
+BATCH_STATE_TTL = 7 * 24 * 3600
+
+# Cache aperta una sola volta
+_cache = None
+
+# Batch in attesa se la cache su disco non e' disponibile (solo in memoria)
+_pending_batches: Dict[str, Dict] = {}
+
+
+def _get_cache():
+    """Open the disk cache on first use."""
+    global _cache
+
+    if _cache is None and diskcache is not None:
+        try:
+            _cache = diskcache.Cache(CACHE_DIR)
+        except Exception as e:
+            logger.warning(f"Unable to open analysis cache in {CACHE_DIR}: {str(e)}")
+
+    return _cache
+
+
+def is_cache_available() -> bool:
+    """Check if the analysis cache can be used."""
+    return _get_cache() is not None
+
+
+def make_cache_key(text: str, namespace: str) -> str:
+    """
+    Build the exact-match cache key for a text.
+
+    Args:
+        text (str): Meeting text
+        namespace (str): Model and prompt version the result depends on
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    return hashlib.sha256(f"{namespace}\x00{text}".encode("utf-8")).hexdigest()
+
+
+def get_cached_analysis(key: str) -> Optional[Dict]:
+    """
+    Look up an analysis by exact cache key.
+
+    Args:
+        key (str): Key built with make_cache_key
+
+    Returns:
+        Optional[Dict]: Cached analysis or None if not found
+    """
+    cache = _get_cache()
+    if cache is None:
+        return None
+
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.warning(f"Error reading analysis cache: {str(e)}")
+        return None
+
+
+def embed_text(client, text: str) -> Optional[List[float]]:
+    """
+    Compute the embedding used by the semantic cache.
+
+    The embedded input is a sample of slices spread across the whole text,
+    so meetings that only share their opening do not look alike.
+
+    Args:
+        client: OpenAI client
+        text (str): Meeting text
+
+    Returns:
+        Optional[List[float]]: Embedding vector or None if error
+    """
+    try:
+        response = client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=_sample_text(text)
+        )
+        return response.data[0].embedding
+    except Exception as e:
+        logger.warning(f"Unable to compute embedding for semantic cache: {str(e)}")
+        return None
+
+
+def find_similar_analysis(embedding: List[float], namespace: str, token_count: int) -> Optional[Dict]:
+    """
+    Look up the analysis of the most similar cached text.
+
+    Args:
+        embedding (List[float]): Embedding of the text to analyze
+        namespace (str): Model, prompt version and API key scope the result depends on
+        token_count (int): Token count of the text to analyze
+
+    Returns:
+        Optional[Dict]: Cached analysis if cosine similarity >= SIMILARITY_THRESHOLD
+            and the token counts differ by at most TOKEN_COUNT_TOLERANCE, else None
+    """
+    cache = _get_cache()
+    if cache is None or np is None:
+        return None
+
+    try:
+        index = cache.get(_index_key(namespace))
+        if not index:
+            return None
+
+        query = _normalize(embedding)
+        similarities = index["matrix"].astype(np.float32) @ query
+
+        # Only texts of about the same length are candidates
+        token_counts = np.asarray(index["token_counts"], dtype=np.float32)
+        tolerance = TOKEN_COUNT_TOLERANCE * np.maximum(token_counts, token_count)
+        similarities[np.abs(token_counts - token_count) > tolerance] = -1.0
+
+        best = int(np.argmax(similarities))
+
+        if similarities[best] < SIMILARITY_THRESHOLD:
+            return None
+
+        logger.info(f"Semantic cache hit (similarity {similarities[best]:.3f})")
+        return cache.get(index["keys"][best])
+
+    except Exception as e:
+        logger.warning(f"Error reading semantic cache: {str(e)}")
+        return None
+
+
+def store_analysis(key: str, result: Dict, namespace: str, embedding: Optional[List[float]] = None,
+                   token_count: int = 0) -> None:
+    """
+    Save an analysis in the cache.
+
+    Args:
+        key (str): Key built with make_cache_key
+        result (Dict): Analysis to cache
+        namespace (str): Model, prompt version and API key scope the result depends on
+        embedding (Optional[List[float]]): Embedding to add to the semantic index
+        token_count (int): Token count of the analyzed text (stored with the embedding)
+    """
+    cache = _get_cache()
+    if cache is None:
+        return
+
+    try:
+        cache.set(key, result)
+
+        if embedding is None or np is None:
+            return
+
+        # Embeddings are kept as a single Nx1536 float16 matrix for brute-force search
+        with cache.transact():
+            index_key = _index_key(namespace)
+            index = cache.get(index_key) or {
+                "keys": [],
+                "token_counts": [],
+                "matrix": np.empty((0, len(embedding)), dtype=np.float16)
+            }
+            index["keys"].append(key)
+            index["token_counts"].append(token_count)
+            index["matrix"] = np.vstack([index["matrix"], _normalize(embedding).astype(np.float16)])
+            cache.set(index_key, index)
+
+    except Exception as e:
+        logger.warning(f"Error writing analysis cache: {str(e)}")
+
+
+def store_batch_state(batch_id: str, state: Dict) -> None:
+    """
+    Persist the state of a submitted Batch API job, so its results can be
+    collected later (also after a restart of the app).
+
+    Args:
+        batch_id (str): Batch id
+        state (Dict): Pending requests, cached results and labels of the batch
+    """
+    cache = _get_cache()
+    if cache is None:
+        _pending_batches[batch_id] = state
+        return
+
+    try:
+        cache.set(_batch_key(batch_id), state, expire=BATCH_STATE_TTL)
+    except Exception as e:
+        logger.warning(f"Error writing batch state: {str(e)}")
+        _pending_batches[batch_id] = state
+
+
+def get_batch_state(batch_id: str) -> Optional[Dict]:
+    """
+    Look up the state of a submitted Batch API job.
+
+    Args:
+        batch_id (str): Batch id
+
+    Returns:
+        Optional[Dict]: Batch state or None if unknown
+    """
+    if batch_id in _pending_batches:
+        return _pending_batches[batch_id]
+
+    cache = _get_cache()
+    if cache is None:
+        return None
+
+    try:
+        return cache.get(_batch_key(batch_id))
+    except Exception as e:
+        logger.warning(f"Error reading batch state: {str(e)}")
+        return None
+
+
+def _batch_key(batch_id: str) -> str:
+    """Return the cache key of a Batch API job state."""
+    return f"batch:{batch_id}"
+
+
+def _index_key(namespace: str) -> str:
+    """Return the cache key of the semantic index for a namespace."""
+    return f"embeddings:{namespace}"
+
+
+def _sample_text(text: str) -> str:
+    """Return EMBEDDING_SAMPLES evenly spaced slices of the text, EMBEDDING_INPUT_CHARS in total."""
+    if len(text) <= EMBEDDING_INPUT_CHARS:
+        return text
+
+    size = EMBEDDING_INPUT_CHARS // EMBEDDING_SAMPLES
+    step = (len(text) - size) / (EMBEDDING_SAMPLES - 1)
+    return "\n".join(text[round(i * step):round(i * step) + size] for i in range(EMBEDDING_SAMPLES))
+
+
+def _normalize(embedding: List[float]):
+    """Return the embedding as a unit-norm float32 vector."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
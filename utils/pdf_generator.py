@@ -6,30 +6,124 @@ Uses reportlab to create well-formatted documents.
 import os
 import tempfile
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
 
 try:
     from reportlab.lib.pagesizes import A4
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
+    from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate, Paragraph, Spacer, PageBreak
     from reportlab.lib import colors
 except ImportError:
     A4 = None
     getSampleStyleSheet = None
     ParagraphStyle = None
     inch = None
-    SimpleDocTemplate = None
+    BaseDocTemplate = None
+    Frame = None
+    PageTemplate = None
     Paragraph = None
     Spacer = None
     PageBreak = None
     colors = None
 
-# Configurazione logging
+# Logger del modulo
 import logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Stili e impostazioni del documento (costruiti una sola volta)
+if BaseDocTemplate is not None:
+    _STYLES = getSampleStyleSheet()
+    
+    # Title style
+    _TITLE_STYLE = ParagraphStyle(
+        'CustomTitle',
+        parent=_STYLES['Heading1'],
+        fontSize=18,
+        spaceAfter=30,
+        alignment=1,  # Centered
+        textColor=colors.darkblue
+    )
+    
+    # Section style
+    _SECTION_STYLE = ParagraphStyle(
+        'CustomSection',
+        parent=_STYLES['Heading2'],
+        fontSize=14,
+        spaceAfter=12,
+        spaceBefore=20,
+        textColor=colors.darkblue
+    )
+    
+    # Normal text style
+    _NORMAL_STYLE = ParagraphStyle(
+        'CustomNormal',
+        parent=_STYLES['Normal'],
+        fontSize=11,
+        spaceAfter=6,
+        leading=14
+    )
+    
+    # List style
+    _LIST_STYLE = ParagraphStyle(
+        'CustomList',
+        parent=_STYLES['Normal'],
+        fontSize=11,
+        spaceAfter=3,
+        leftIndent=20,
+        bulletIndent=10
+    )
+    
+    # Footer style
+    _FOOTER_STYLE = ParagraphStyle(
+        'Footer',
+        parent=_STYLES['Normal'],
+        fontSize=9,
+        alignment=1
+    )
+    
+    _DOC_KWARGS = dict(
+        pagesize=A4,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=72,
+        bottomMargin=18
+    )
+    
+    class _StreamingDocTemplate(BaseDocTemplate):
+        """Single-frame document built from an iterator of flowables."""
+        
+        def __init__(self, filename, **kwargs):
+            super().__init__(filename, **kwargs)
+            frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id='normal')
+            self.addPageTemplates([PageTemplate(id='Normal', frames=frame, pagesize=self.pagesize)])
+        
+        def build_from_iterator(self, flowables: Iterator) -> None:
+            """
+            Lay out flowables as they are produced, like BaseDocTemplate.build
+            but without requiring the whole story as a list.
+            
+            Args:
+                flowables (Iterator): Flowables in document order
+            """
+            self._startBuild()
+            canv = self.canv
+            saved_info = canv._doc.info
+            
+            try:
+                canv._doctemplate = self
+                for flowable in flowables:
+                    # handle_flowable puts back the remainder of a split flowable
+                    pending = [flowable]
+                    while pending:
+                        self.clean_hanging()
+                        self.handle_flowable(pending)
+            finally:
+                del canv._doctemplate
+            
+            canv._doc.info = saved_info
+            self._endBuild()
+
 
 def generate_pdf(meeting_data: Dict) -> Optional[str]:
     """
@@ -45,121 +139,18 @@ def generate_pdf(meeting_data: Dict) -> Optional[str]:
         logger.error("Meeting data not provided")
         return None
     
-    if SimpleDocTemplate is None:
+    if BaseDocTemplate is None:
         logger.error("reportlab not installed. Install with: pip install reportlab")
         return None
     
     try:
-        # Create temporary file
-        temp_dir = tempfile.gettempdir()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        pdf_filename = f"meeting_summary_{timestamp}.pdf"
-        pdf_path = os.path.join(temp_dir, pdf_filename)
-        
-        # Create PDF document
-        doc = SimpleDocTemplate(
-            pdf_path,
-            pagesize=A4,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=18
-        )
-        
-        # Custom styles
-        styles = getSampleStyleSheet()
-        
-        # Title style
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=1,  # Centered
-            textColor=colors.darkblue
-        )
-        
-        # Section style
-        section_style = ParagraphStyle(
-            'CustomSection',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=12,
-            spaceBefore=20,
-            textColor=colors.darkblue
-        )
-        
-        # Normal text style
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontSize=11,
-            spaceAfter=6,
-            leading=14
-        )
-        
-        # List style
-        list_style = ParagraphStyle(
-            'CustomList',
-            parent=styles['Normal'],
-            fontSize=11,
-            spaceAfter=3,
-            leftIndent=20,
-            bulletIndent=10
-        )
-        
-        # Build content
-        story = []
-        
-        # Title
-        story.append(Paragraph("Meeting Summary", title_style))
-        story.append(Spacer(1, 12))
+        # Create temporary file with a unique name (no clashes between concurrent requests)
+        with tempfile.NamedTemporaryFile(prefix="meeting_summary_", suffix=".pdf", delete=False) as temp_file:
+            pdf_path = temp_file.name
         
-        # Date and info
-        current_date = datetime.now().strftime("%m/%d/%Y %H:%M")
-        story.append(Paragraph(f"<b>Analysis date:</b> {current_date}", normal_style))
-        story.append(Spacer(1, 20))
-        
-        # Summary
-        story.append(Paragraph("Summary", section_style))
-        summary_text = meeting_data.get("summary", "Summary not available")
-        story.append(Paragraph(summary_text, normal_style))
-        story.append(Spacer(1, 20))
-        
-        # Main topics
-        story.append(Paragraph("Main Topics", section_style))
-        topics = meeting_data.get("topics", [])
-        if topics:
-            for topic in topics:
-                story.append(Paragraph(f"• {topic}", list_style))
-        else:
-            story.append(Paragraph("Topics not available", normal_style))
-        story.append(Spacer(1, 20))
-        
-        # Keywords
-        story.append(Paragraph("Keywords", section_style))
-        keywords = meeting_data.get("keywords", [])
-        if keywords:
-            # Group keywords in rows of 3-4
-            keyword_lines = []
-            for i in range(0, len(keywords), 4):
-                line_keywords = keywords[i:i+4]
-                keyword_lines.append(" • ".join(line_keywords))
-            
-            for line in keyword_lines:
-                story.append(Paragraph(f"• {line}", list_style))
-        else:
-            story.append(Paragraph("Keywords not available", normal_style))
-        
-        # Footer
-        story.append(Spacer(1, 30))
-        story.append(Paragraph(
-            f"<i>Automatically generated on {current_date} by Meeting Summarizer</i>",
-            ParagraphStyle('Footer', parent=styles['Normal'], fontSize=9, alignment=1)
-        ))
-        
-        # Generate PDF
-        doc.build(story)
+        # Create PDF document and lay out content as it is produced
+        doc = _StreamingDocTemplate(pdf_path, **_DOC_KWARGS)
+        doc.build_from_iterator(_iter_flowables(meeting_data))
         
         logger.info(f"PDF generated successfully: {pdf_path}")
         return pdf_path
@@ -169,6 +160,59 @@ def generate_pdf(meeting_data: Dict) -> Optional[str]:
         return None
 
 
+def _iter_flowables(meeting_data: Dict) -> Iterator:
+    """
+    Yield the PDF content one flowable at a time.
+    
+    Args:
+        meeting_data (Dict): Meeting data with summary, topics, keywords
+        
+    Yields:
+        Flowable: Paragraphs and spacers in document order
+    """
+    # Title
+    yield Paragraph("Meeting Summary", _TITLE_STYLE)
+    yield Spacer(1, 12)
+    
+    # Date and info
+    current_date = datetime.now().strftime("%m/%d/%Y %H:%M")
+    yield Paragraph(f"<b>Analysis date:</b> {current_date}", _NORMAL_STYLE)
+    yield Spacer(1, 20)
+    
+    # Summary
+    yield Paragraph("Summary", _SECTION_STYLE)
+    summary_text = meeting_data.get("summary", "Summary not available")
+    yield Paragraph(summary_text, _NORMAL_STYLE)
+    yield Spacer(1, 20)
+    
+    # Main topics
+    yield Paragraph("Main Topics", _SECTION_STYLE)
+    topics = meeting_data.get("topics", [])
+    if topics:
+        for topic in topics:
+            yield Paragraph(f"• {topic}", _LIST_STYLE)
+    else:
+        yield Paragraph("Topics not available", _NORMAL_STYLE)
+    yield Spacer(1, 20)
+    
+    # Keywords
+    yield Paragraph("Keywords", _SECTION_STYLE)
+    keywords = meeting_data.get("keywords", [])
+    if keywords:
+        # Group keywords in rows of 4
+        for i in range(0, len(keywords), 4):
+            yield Paragraph(f"• {' • '.join(keywords[i:i+4])}", _LIST_STYLE)
+    else:
+        yield Paragraph("Keywords not available", _NORMAL_STYLE)
+    
+    # Footer
+    yield Spacer(1, 30)
+    yield Paragraph(
+        f"<i>Automatically generated on {current_date} by Meeting Summarizer</i>",
+        _FOOTER_STYLE
+    )
+
+
 def cleanup_temp_pdf(pdf_path: str) -> None:
     """
     Clean up temporary PDF file.
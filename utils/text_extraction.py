@@ -3,10 +3,17 @@ Module for extracting text from different file formats.
 Supports: TXT, PDF, DOCX
 """
 
+import codecs
 import os
 import logging
+import zipfile
 from typing import Optional
 
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
 try:
     import PyPDF2
 except ImportError:
@@ -17,10 +24,24 @@ try:
 except ImportError:
     Document = None
 
-# Configurazione logging
-logging.basicConfig(level=logging.INFO)
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+# Logger del modulo
 logger = logging.getLogger(__name__)
 
+# Estensioni dei documenti supportati
+_TEXT_EXTS = frozenset(('.txt', '.pdf', '.docx'))
+
+# Tag WordprocessingML letti direttamente da word/document.xml
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = _W_NS + "p"
+_W_T = _W_NS + "t"
+_W_TAB = _W_NS + "tab"
+_W_BR = _W_NS + "br"
+
 
 def extract_text(file_path: str) -> Optional[str]:
     """
@@ -32,10 +53,6 @@ def extract_text(file_path: str) -> Optional[str]:
     Returns:
         Optional[str]: Extracted text or None if error
     """
-    if not os.path.exists(file_path):
-        logger.error(f"File not found: {file_path}")
-        return None
-    
     file_extension = os.path.splitext(file_path)[1].lower()
     
     try:
@@ -49,6 +66,9 @@ def extract_text(file_path: str) -> Optional[str]:
             logger.error(f"Unsupported file format: {file_extension}")
             return None
             
+    except FileNotFoundError:
+        logger.error(f"File not found: {file_path}")
+        return None
     except Exception as e:
         logger.error(f"Error extracting text from {file_path}: {str(e)}")
         return None
@@ -56,50 +76,110 @@ def extract_text(file_path: str) -> Optional[str]:
 
 def _extract_from_txt(file_path: str) -> str:
     """Extract text from TXT file."""
+    # Read raw bytes once, then only decoding is retried
+    with open(file_path, 'rb') as file:
+        data = file.read()
+    
+    # Byte order mark identifies the encoding directly
+    if data.startswith(codecs.BOM_UTF8):
+        return _normalize_newlines(data.decode('utf-8-sig'))
+    if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return _normalize_newlines(data.decode('utf-16'))
+    
     encodings = ['utf-8', 'latin-1', 'cp1252']
     
     for encoding in encodings:
         try:
-            with open(file_path, 'r', encoding=encoding) as file:
-                return file.read()
+            return _normalize_newlines(data.decode(encoding))
         except UnicodeDecodeError:
             continue
     
     # If all encodings fail, try with error handling
-    with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
-        return file.read()
+    return _normalize_newlines(data.decode('utf-8', errors='replace'))
+
+
+def _normalize_newlines(text: str) -> str:
+    """Normalize line endings the way text-mode open() does."""
+    return text.replace('\r\n', '\n').replace('\r', '\n')
 
 
 def _extract_from_pdf(file_path: str) -> str:
     """Extract text from PDF file."""
+    if pdfium is not None:
+        return _extract_from_pdf_pdfium(file_path)
+    
+    # Fallback: PyPDF2 (pure Python, piu' lento)
     if PyPDF2 is None:
-        raise ImportError("PyPDF2 not installed. Install with: pip install pypdf2")
+        raise ImportError("pypdfium2 not installed. Install with: pip install pypdfium2")
     
-    text = ""
     with open(file_path, 'rb') as file:
         pdf_reader = PyPDF2.PdfReader(file)
-        
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            text += page.extract_text() + "\n"
+        parts = [page.extract_text() for page in pdf_reader.pages]
     
-    return text.strip()
+    return "\n".join(parts).strip()
+
+
+def _extract_from_pdf_pdfium(file_path: str) -> str:
+    """Extract text from PDF file with PDFium."""
+    pdf = pdfium.PdfDocument(file_path)
+    parts = []
+    
+    try:
+        for page_index in range(len(pdf)):
+            page = pdf[page_index]
+            textpage = page.get_textpage()
+            parts.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
+    
+    return "\n".join(parts).strip()
 
 
 def _extract_from_docx(file_path: str) -> str:
     """Extract text from DOCX file."""
+    if etree is not None:
+        try:
+            return _extract_from_docx_xml(file_path)
+        except (etree.XMLSyntaxError, KeyError) as e:
+            logger.warning(f"Unable to parse DOCX XML, using python-docx: {str(e)}")
+    
     if Document is None:
         raise ImportError("python-docx not installed. Install with: pip install python-docx")
     
     doc = Document(file_path)
-    text = ""
+    parts = [paragraph.text for paragraph in doc.paragraphs]
+    
+    return "\n".join(parts).strip()
+
+
+def _extract_from_docx_xml(file_path: str) -> str:
+    """Extract paragraph text from DOCX file by streaming word/document.xml."""
+    parts = []
+    runs = []
     
-    for paragraph in doc.paragraphs:
-        text += paragraph.text + "\n"
+    with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as xml_file:
+        for _, element in etree.iterparse(xml_file, tag=(_W_P, _W_T, _W_TAB, _W_BR)):
+            if element.tag == _W_T:
+                if element.text:
+                    runs.append(element.text)
+            elif element.tag == _W_TAB:
+                runs.append("\t")
+            elif element.tag == _W_BR:
+                runs.append("\n")
+            else:
+                # End of paragraph: its text nodes are no longer needed, nor
+                # are the already parsed siblings still attached to the parent
+                parts.append("".join(runs))
+                runs = []
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
     
-    return text.strip()
+    return "\n".join(parts).strip()
 
 
 def get_supported_extensions() -> list:
     """Return supported file extensions."""
-    return ['.txt', '.pdf', '.docx']
+    return sorted(_TEXT_EXTS)
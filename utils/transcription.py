@@ -5,46 +5,161 @@ Optimized for CPU with whisper-tiny model.
 
 import os
 import logging
-from typing import Optional
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
 try:
-    import torch
-    from transformers import WhisperProcessor, WhisperForConditionalGeneration
-    import librosa
-except ImportError as e:
-    print(f"Import error: {e}")
-    torch = None
-    WhisperProcessor = None
-    WhisperForConditionalGeneration = None
-    librosa = None
-
-# Configurazione logging
-logging.basicConfig(level=logging.INFO)
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import soundfile as sf
+except ImportError:
+    sf = None
+
+try:
+    import soxr
+except ImportError:
+    soxr = None
+
+# Logger del modulo
 logger = logging.getLogger(__name__)
 
+# Modello Whisper e cartella della cache del modello gia' costruito
+MODEL_NAME = "openai/whisper-tiny"
+MODEL_CACHE_DIR = os.path.expanduser("~/.cache/meeting_summarizer/models")
+
+# Modello esportato in ONNX (int8) per ONNX Runtime su CPU, vedi README
+ONNX_MODEL_DIR = os.path.join(MODEL_CACHE_DIR, "whisper_tiny_onnx_int8")
+
+# Frequenza di campionamento attesa da Whisper
+SAMPLE_RATE = 16000
+
+# Token generati al massimo per finestra di 30 secondi
+MAX_NEW_TOKENS = 220
+
+# Audio lunghi: finestre da 30 s sovrapposte, generate a gruppi di finestre
+CHUNK_SECONDS = 30
+CHUNK_OVERLAP_SECONDS = 5
+GENERATE_BATCH_SIZE = 16
+MAX_OVERLAP_WORDS = 30
+
+# Estensioni audio supportate
+_AUDIO_EXTS = frozenset(('.mp3', '.wav', '.m4a', '.flac', '.ogg'))
+
+# Decodifica audio: libsndfile per i formati non compressi, ffmpeg per mp3/m4a
+_SOUNDFILE_EXTENSIONS = frozenset(('.wav', '.flac', '.ogg'))
+_FFMPEG_EXTENSIONS = frozenset(('.mp3', '.m4a'))
+_FFMPEG = shutil.which("ffmpeg")
+
+# Moduli pesanti importati al primo utilizzo (vedi _import_backend)
+torch = None
+WhisperProcessor = None
+WhisperForConditionalGeneration = None
+librosa = None
+torchaudio = None
+
 # Variabili globali per il modello (caricato una sola volta)
 _model = None
 _processor = None
+_device = None
+_dtype = None
+_copy_stream = None
+_mel = None
+
+# Silero VAD per eliminare i silenzi prima della trascrizione
+# (release fissata: torch.hub esegue il codice del repo scaricato)
+VAD_REPO = "snakers4/silero-vad:v5.1"
+_vad_model = None
+_get_speech_timestamps = None
+_vad_lock = threading.Lock()
+
+# Lock per caricare i modelli una sola volta anche con richieste concorrenti
+_load_lock = threading.Lock()
+
+# Backend faster-whisper (CTranslate2, int8): opzionale, usato se installato (pip install faster-whisper)
+_fw_model = None
+_fw_checked = False
+
+
+def _import_backend() -> bool:
+    """
+    Import torch, transformers and librosa on first use, so that importing
+    this module (e.g. for the supported extensions) stays fast.
+    
+    Returns:
+        bool: True if all modules are available, False otherwise
+    """
+    global torch, WhisperProcessor, WhisperForConditionalGeneration, librosa, torchaudio
+    
+    if torch is not None:
+        return True
+    
+    try:
+        import librosa
+        from transformers import WhisperProcessor, WhisperForConditionalGeneration
+        import torch
+    except ImportError as e:
+        logger.error(f"Import error: {e}")
+        return False
+    
+    # Optional: log-mel features computed with torch instead of NumPy
+    try:
+        import torchaudio
+    except ImportError:
+        torchaudio = None
+    
+    # Use all cores for CPU inference
+    torch.set_num_threads(os.cpu_count() or 1)
+    
+    # GPU: TF32 matmuls and cuDNN autotuning (fixed 30 s input shape)
+    if torch.cuda.is_available():
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+        torch.backends.cudnn.benchmark = True
+    
+    return True
 
 
 def load_whisper_model():
     """Load Whisper tiny model optimized for CPU."""
-    global _model, _processor
+    global _model, _processor, _device, _dtype, _mel
     
-    if _model is None or _processor is None:
+    # Fast path: model already loaded
+    if _model is not None and _processor is not None:
+        return _model, _processor
+    
+    # Only one thread loads the model, the others wait for it
+    with _load_lock:
+        if _model is not None and _processor is not None:
+            return _model, _processor
+        
+        if not _import_backend():
+            raise ImportError("torch, transformers and librosa are required for transcription")
+        
         try:
             logger.info("Loading Whisper tiny model...")
             
-            # Load processor and model
-            _processor = WhisperProcessor.from_pretrained("openai/whisper-tiny")
-            _model = WhisperForConditionalGeneration.from_pretrained("openai/whisper-tiny")
+            _device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+            _dtype = torch.float16 if _device.type == "cuda" else torch.float32
             
-            # Configure for CPU
-            _model.eval()
-            if torch.cuda.is_available():
-                _model = _model.to("cuda")
+            # Exported ONNX model (CPU only), if present
+            onnx_model = _load_onnx_model() if _device.type == "cpu" else None
+            if onnx_model is not None:
+                model, processor = onnx_model
             else:
-                _model = _model.to("cpu")
+                model, processor = _load_torch_model(quantize=_device.type == "cpu")
+            
+            _mel = _build_mel_transform(processor)
+            _load_vad_model()
+            
+            # Published last, so the fast path never sees a half-loaded model
+            _processor = processor
+            _model = model
             
             logger.info("Whisper model loaded successfully")
             
@@ -55,6 +170,213 @@ def load_whisper_model():
     return _model, _processor
 
 
+def _load_torch_model(quantize: bool):
+    """
+    Load the PyTorch Whisper model, from the local cache if available.
+    
+    Args:
+        quantize (bool): Whether to apply int8 dynamic quantization
+        
+    Returns:
+        tuple: (model, processor)
+    """
+    global _copy_stream
+    
+    # Prebuilt model from the local cache (no HF Hub lookup)
+    cache_path = _get_model_cache_path(quantize)
+    cached = _load_cached_model(cache_path)
+    if cached is not None:
+        model, processor = cached
+    else:
+        # Load processor and model
+        processor = WhisperProcessor.from_pretrained(MODEL_NAME)
+        model = WhisperForConditionalGeneration.from_pretrained(MODEL_NAME)
+        model.eval()
+        
+        if quantize:
+            # Dynamic int8 quantization of the Linear layers (CPU only)
+            model = torch.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        
+        _save_cached_model(cache_path, model, processor)
+    
+    model.eval()
+    if _device.type == "cuda":
+        # Half precision on GPU
+        model = model.to(_device).half()
+        
+        # Stream for host-to-device copies overlapping inference
+        _copy_stream = torch.cuda.Stream()
+        
+        _compile_model(model, processor)
+    
+    return model, processor
+
+
+def _compile_model(model, processor) -> None:
+    """
+    Compile the decoder step with a static KV cache (CUDA graphs) and warm it up.
+    
+    Args:
+        model: Whisper model on CUDA
+        processor: Whisper processor
+    """
+    forward = model.forward
+    
+    try:
+        model.generation_config.cache_implementation = "static"
+        model.forward = torch.compile(forward, mode="reduce-overhead", fullgraph=True)
+        
+        # Warmup: compilation and graph capture happen on the first calls
+        logger.info("Compiling Whisper model...")
+        dummy_features = torch.zeros(
+            1, model.config.num_mel_bins, 3000, device=_device, dtype=_dtype
+        )
+        _generate(model, processor, dummy_features, "en")
+        
+    except Exception as e:
+        logger.warning(f"Unable to compile Whisper model, using eager mode: {str(e)}")
+        model.forward = forward
+        model.generation_config.cache_implementation = None
+
+
+def _load_onnx_model():
+    """
+    Load the Whisper model exported to ONNX (see ONNX_MODEL_DIR) with ONNX Runtime.
+    
+    Returns:
+        Optional[tuple]: (model, processor) or None if not exported or not installed
+    """
+    if not os.path.isdir(ONNX_MODEL_DIR):
+        return None
+    
+    try:
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+    except ImportError:
+        logger.info("optimum[onnxruntime] not installed, using PyTorch model")
+        return None
+    
+    try:
+        session_options = onnxruntime.SessionOptions()
+        session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        
+        model = ORTModelForSpeechSeq2Seq.from_pretrained(
+            ONNX_MODEL_DIR,
+            provider="CPUExecutionProvider",
+            session_options=session_options
+        )
+        
+        # Processor files are not always copied by the quantizer
+        has_processor = os.path.isfile(os.path.join(ONNX_MODEL_DIR, "preprocessor_config.json"))
+        processor = WhisperProcessor.from_pretrained(ONNX_MODEL_DIR if has_processor else MODEL_NAME)
+        
+        logger.info(f"Whisper ONNX model loaded from {ONNX_MODEL_DIR}")
+        return model, processor
+        
+    except Exception as e:
+        logger.warning(f"Unable to load Whisper ONNX model, using PyTorch model: {str(e)}")
+        return None
+
+
+def _get_model_cache_path(quantize: bool) -> str:
+    """
+    Return the path of the serialized model for the current configuration.
+    
+    Args:
+        quantize (bool): Whether the model is int8-quantized
+        
+    Returns:
+        str: Cache file path (depends on model, quantization and library versions)
+    """
+    import transformers
+    
+    variant = "int8" if quantize else "fp32"
+    file_name = f"{MODEL_NAME.replace('/', '--')}-{variant}-torch{torch.__version__}-transformers{transformers.__version__}.pt"
+    return os.path.join(MODEL_CACHE_DIR, file_name)
+
+
+def _load_cached_model(cache_path: str):
+    """
+    Load model and processor saved by _save_cached_model.
+    
+    Args:
+        cache_path (str): Cache file path
+        
+    Returns:
+        Optional[tuple]: (model, processor) or None if not cached
+    """
+    if not os.path.isfile(cache_path):
+        return None
+    
+    try:
+        # mmap: weights are paged in from the file instead of copied
+        cached = torch.load(cache_path, map_location="cpu", mmap=True, weights_only=False)
+        logger.info(f"Whisper model loaded from cache: {cache_path}")
+        return cached["model"], cached["processor"]
+    except Exception as e:
+        logger.warning(f"Unable to load cached Whisper model: {str(e)}")
+        return None
+
+
+def _save_cached_model(cache_path: str, model, processor) -> None:
+    """Serialize the built model and its processor for the next start."""
+    try:
+        os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+        
+        # Write to a temp file first so a partial file is never loaded
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        torch.save({"model": model, "processor": processor}, tmp_path, _use_new_zipfile_serialization=True)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.warning(f"Unable to cache Whisper model: {str(e)}")
+
+
+def load_faster_whisper_model():
+    """
+    Load Whisper tiny with faster-whisper (CTranslate2, int8 weights).
+    
+    Returns:
+        WhisperModel or None if faster-whisper is not available
+    """
+    global _fw_model, _fw_checked
+    
+    if _fw_checked:
+        return _fw_model
+    
+    with _load_lock:
+        if _fw_checked:
+            return _fw_model
+        
+        try:
+            import ctranslate2
+            from faster_whisper import WhisperModel
+            
+            if ctranslate2.get_cuda_device_count() > 0:
+                device, compute_type = "cuda", "int8_float16"
+            else:
+                device, compute_type = "cpu", "int8"
+            
+            logger.info(f"Loading faster-whisper tiny model ({device}, {compute_type})...")
+            _fw_model = WhisperModel(
+                "tiny",
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=os.cpu_count() or 0
+            )
+            logger.info("faster-whisper model loaded successfully")
+            
+        except ImportError:
+            logger.info("faster-whisper not installed, using transformers backend")
+        except Exception as e:
+            logger.warning(f"Unable to load faster-whisper, using transformers backend: {str(e)}")
+        
+        _fw_checked = True
+    
+    return _fw_model
+
+
 def transcribe_audio(file_path: str, language: str = "en") -> Optional[str]:
     """
     Transcribe an audio file using Whisper.
@@ -66,12 +388,12 @@ def transcribe_audio(file_path: str, language: str = "en") -> Optional[str]:
     Returns:
         Optional[str]: Text transcription or None if error
     """
-    if not os.path.exists(file_path):
-        logger.error(f"Audio file not found: {file_path}")
-        return None
+    fw_model = load_faster_whisper_model()
+    if fw_model is not None:
+        return _transcribe_faster_whisper(fw_model, file_path, language)
     
-    if librosa is None:
-        logger.error("librosa not installed. Install with: pip install librosa")
+    if not _import_backend():
+        logger.error("Transcription dependencies not installed. Install with: pip install torch transformers librosa")
         return None
     
     try:
@@ -80,32 +402,440 @@ def transcribe_audio(file_path: str, language: str = "en") -> Optional[str]:
         
         # Load and preprocess audio
         logger.info(f"Loading audio file: {file_path}")
-        audio_array, sample_rate = librosa.load(file_path, sr=16000)
-        
-        # Preprocess audio
-        inputs = processor(audio_array, sampling_rate=sample_rate, return_tensors="pt")
-        
-        # Move to appropriate device
-        device = next(model.parameters()).device
-        inputs = {k: v.to(device) for k, v in inputs.items()}
+        audio_array = _trim_silence(_load_audio(file_path))
         
         # Generate transcription
         logger.info("Generating transcription...")
-        with torch.no_grad():
-            predicted_ids = model.generate(
-                inputs["input_features"],
-                max_length=448,
-                num_beams=1,
-                do_sample=False,
-                language=language
+        # Long recordings are split into overlapping 30 s windows
+        chunks = _split_audio(audio_array)
+        transcription = _stitch_chunks(_generate_transcriptions(model, processor, chunks, language))
+        
+        logger.info("Transcription completed successfully")
+        return transcription
+        
+    except FileNotFoundError:
+        logger.error(f"Audio file not found: {file_path}")
+        return None
+    except Exception as e:
+        logger.error(f"Error during transcription of {file_path}: {str(e)}")
+        return None
+
+
+def transcribe_audio_batch(file_paths: List[str], language: str = "en", batch_size: int = 8) -> List[Optional[str]]:
+    """
+    Transcribe several audio files, running Whisper on batches of clips.
+    
+    Args:
+        file_paths (List[str]): Paths to audio files
+        language (str): Language of audio content (default: "en" for English)
+        batch_size (int): Number of clips per generate call
+        
+    Returns:
+        List[Optional[str]]: Transcriptions in input order (None for files that failed)
+    """
+    results = [None] * len(file_paths)
+    if not file_paths:
+        return results
+    
+    # CTranslate2 is already fast per file, no cross-file batching
+    fw_model = load_faster_whisper_model()
+    if fw_model is not None:
+        return [_transcribe_faster_whisper(fw_model, path, language) for path in file_paths]
+    
+    if not _import_backend():
+        logger.error("Transcription dependencies not installed. Install with: pip install torch transformers librosa")
+        return results
+    
+    try:
+        model, processor = load_whisper_model()
+    except Exception as e:
+        logger.error(f"Error loading Whisper model: {str(e)}")
+        return results
+    
+    batches = [list(range(start, min(start + batch_size, len(file_paths))))
+               for start in range(0, len(file_paths), batch_size)]
+    
+    # Pipeline: batch N+1 is decoded and featurized on CPU while Whisper runs on batch N
+    with ThreadPoolExecutor(max_workers=min(8, len(file_paths))) as loader, \
+            ThreadPoolExecutor(max_workers=1) as producer:
+        next_batch = producer.submit(_prepare_batch, loader, model, processor, [file_paths[i] for i in batches[0]])
+        
+        for number, indices in enumerate(batches):
+            try:
+                owners, input_features, ready = next_batch.result()
+            except Exception as e:
+                logger.error(f"Error preparing audio batch: {str(e)}")
+                owners, input_features, ready = [], None, None
+            
+            if number + 1 < len(batches):
+                next_batch = producer.submit(
+                    _prepare_batch, loader, model, processor, [file_paths[i] for i in batches[number + 1]]
+                )
+            
+            if input_features is None:
+                continue
+            
+            if ready is not None:
+                # Wait for the host-to-device copy issued on the copy stream
+                torch.cuda.current_stream().wait_event(ready)
+                input_features.record_stream(torch.cuda.current_stream())
+            
+            try:
+                logger.info(f"Generating transcriptions for batch of {len(indices)} files ({len(owners)} chunks)...")
+                transcriptions = _decode_features(model, processor, input_features, language)
+            except Exception as e:
+                logger.error(f"Error during batch transcription: {str(e)}")
+                continue
+            
+            # Chunks of the same file are stitched back together
+            chunk_texts = {}
+            for position, transcription in zip(owners, transcriptions):
+                chunk_texts.setdefault(position, []).append(transcription)
+            for position, texts in chunk_texts.items():
+                results[indices[position]] = _stitch_chunks(texts)
+    
+    logger.info("Batch transcription completed")
+    return results
+
+
+def _load_audio(file_path: str):
+    """Load an audio file as a 16 kHz mono float32 array."""
+    file_extension = os.path.splitext(file_path)[1].lower()
+    
+    if file_extension in _FFMPEG_EXTENSIONS and _FFMPEG is not None and np is not None:
+        return _load_audio_ffmpeg(file_path)
+    
+    if file_extension in _SOUNDFILE_EXTENSIONS and sf is not None:
+        audio_array, sample_rate = sf.read(file_path, dtype="float32", always_2d=False)
+        if audio_array.ndim > 1:
+            audio_array = audio_array.mean(axis=1)
+        
+        # Resample only if needed
+        if sample_rate != SAMPLE_RATE:
+            if soxr is not None:
+                audio_array = soxr.resample(audio_array, sample_rate, SAMPLE_RATE)
+            else:
+                audio_array = librosa.resample(audio_array, orig_sr=sample_rate, target_sr=SAMPLE_RATE)
+        return audio_array
+    
+    # Fallback: librosa
+    audio_array, _ = librosa.load(file_path, sr=SAMPLE_RATE)
+    return audio_array
+
+
+def _load_audio_ffmpeg(file_path: str):
+    """Decode and resample an audio file with ffmpeg (16 kHz mono PCM on stdout)."""
+    result = subprocess.run(
+        [_FFMPEG, "-nostdin", "-loglevel", "error", "-i", file_path,
+         "-f", "s16le", "-ar", str(SAMPLE_RATE), "-ac", "1", "-"],
+        capture_output=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {result.stderr.decode(errors='replace').strip()}")
+    
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+
+
+def _try_load_audio(file_path: str):
+    """Load an audio file, returning None (and logging) on error."""
+    try:
+        return _load_audio(file_path)
+    except Exception as e:
+        logger.error(f"Error loading audio file {file_path}: {str(e)}")
+        return None
+
+
+def _prepare_batch(loader: ThreadPoolExecutor, model, processor, file_paths: List[str]):
+    """
+    Decode and featurize a batch of audio files (runs in the producer thread).
+    
+    Args:
+        loader (ThreadPoolExecutor): Pool used to decode the files in parallel
+        model: Whisper model
+        processor: Whisper processor
+        file_paths (List[str]): Paths to audio files of the batch
+        
+    Returns:
+        tuple: (file position of each chunk, input features or None, CUDA event or None)
+    """
+    audio_arrays = list(loader.map(_try_load_audio, file_paths))
+    
+    chunks = []
+    owners = []
+    for position, audio_array in enumerate(audio_arrays):
+        if audio_array is None:
+            continue
+        for chunk in _split_audio(_trim_silence(audio_array)):
+            chunks.append(chunk)
+            owners.append(position)
+    
+    if not chunks:
+        return owners, None, None
+    
+    if _copy_stream is None:
+        return owners, _featurize_groups(processor, chunks), None
+    
+    # Upload and mel computation on a dedicated stream, overlapping inference
+    with torch.cuda.stream(_copy_stream):
+        input_features = _featurize_groups(processor, chunks).to(_device, dtype=_dtype, non_blocking=True)
+        ready = torch.cuda.Event()
+        ready.record(_copy_stream)
+    
+    return owners, input_features, ready
+
+
+def _split_audio(audio_array) -> list:
+    """
+    Split audio into 30 s windows overlapping by CHUNK_OVERLAP_SECONDS.
+    
+    Args:
+        audio_array: 16 kHz mono audio array
+        
+    Returns:
+        list: Audio chunks (the input itself if it fits in one window)
+    """
+    chunk_samples = CHUNK_SECONDS * SAMPLE_RATE
+    if len(audio_array) <= chunk_samples:
+        return [audio_array]
+    
+    overlap_samples = CHUNK_OVERLAP_SECONDS * SAMPLE_RATE
+    step = chunk_samples - overlap_samples
+    return [audio_array[start:start + chunk_samples] for start in range(0, len(audio_array) - overlap_samples, step)]
+
+
+def _stitch_chunks(texts: List[str]) -> str:
+    """
+    Join the transcriptions of consecutive overlapping chunks.
+    
+    The words repeated at the boundary (spoken in the overlap) are kept once.
+    
+    Args:
+        texts (List[str]): Transcriptions in chunk order
+        
+    Returns:
+        str: Full transcription
+    """
+    words = []
+    
+    for text in texts:
+        chunk_words = text.split()
+        overlap = _find_overlap(words, chunk_words)
+        words.extend(chunk_words[overlap:])
+    
+    return " ".join(words)
+
+
+def _find_overlap(previous_words: List[str], next_words: List[str]) -> int:
+    """Return the number of leading words of next_words already at the end of previous_words."""
+    def normalize(word: str) -> str:
+        return word.strip(".,;:!?\"'()").lower()
+    
+    max_overlap = min(len(previous_words), len(next_words), MAX_OVERLAP_WORDS)
+    tail = [normalize(word) for word in previous_words[-max_overlap:]] if max_overlap else []
+    head = [normalize(word) for word in next_words[:max_overlap]]
+    
+    for size in range(max_overlap, 0, -1):
+        if tail[-size:] == head[:size]:
+            return size
+    
+    return 0
+
+
+def _load_vad_model() -> None:
+    """Load the pinned Silero VAD release from torch.hub (cached after the first download)."""
+    global _vad_model, _get_speech_timestamps
+    
+    try:
+        vad_model, vad_utils = torch.hub.load(VAD_REPO, "silero_vad", trust_repo=True)
+        _get_speech_timestamps = vad_utils[0]
+        _vad_model = vad_model
+        logger.info("Silero VAD loaded successfully")
+    except Exception as e:
+        logger.warning(f"Unable to load Silero VAD, silence will not be trimmed: {str(e)}")
+
+
+def _trim_silence(audio_array):
+    """
+    Keep only the speech segments of an audio clip.
+    
+    Args:
+        audio_array: 16 kHz mono float32 audio array
+        
+    Returns:
+        Voiced segments concatenated (the input itself if VAD is unavailable or finds no speech)
+    """
+    if _vad_model is None:
+        return audio_array
+    
+    try:
+        # The VAD model keeps state between windows: one clip at a time
+        with _vad_lock:
+            timestamps = _get_speech_timestamps(
+                torch.from_numpy(audio_array), _vad_model, sampling_rate=SAMPLE_RATE
             )
+    except Exception as e:
+        logger.warning(f"Voice activity detection failed: {str(e)}")
+        return audio_array
+    
+    if not timestamps:
+        return audio_array
+    
+    return np.concatenate([audio_array[segment["start"]:segment["end"]] for segment in timestamps])
+
+
+def _build_mel_transform(processor):
+    """
+    Build the mel filterbank used by Whisper as a torchaudio module on the model device.
+    
+    Args:
+        processor: Whisper processor (for the number of mel bins)
         
-        # Decode the result
-        transcription = processor.batch_decode(predicted_ids, skip_special_tokens=True)[0]
+    Returns:
+        torchaudio.transforms.MelSpectrogram or None if torchaudio is not installed
+    """
+    if torchaudio is None:
+        return None
+    
+    # Same STFT and Slaney mel filters as WhisperFeatureExtractor
+    return torchaudio.transforms.MelSpectrogram(
+        sample_rate=SAMPLE_RATE,
+        n_fft=400,
+        hop_length=160,
+        n_mels=processor.feature_extractor.feature_size,
+        f_min=0.0,
+        f_max=SAMPLE_RATE / 2,
+        power=2.0,
+        norm="slaney",
+        mel_scale="slaney"
+    ).to(_device)
+
+
+def _featurize_groups(processor, audio_arrays: list):
+    """
+    Compute the input features GENERATE_BATCH_SIZE clips at a time.
+    
+    Only the small log-mel output of every group is kept, so the peak memory of
+    the waveform and STFT tensors does not grow with the recording length.
+    """
+    return torch.cat([
+        _featurize(processor, audio_arrays[start:start + GENERATE_BATCH_SIZE])
+        for start in range(0, len(audio_arrays), GENERATE_BATCH_SIZE)
+    ])
+
+
+def _featurize(processor, audio_arrays: list):
+    """Compute the log-mel input features of a batch of audio clips."""
+    if _mel is None:
+        # Every clip is padded to the 30 s window (3000 frames) expected by the encoder
+        inputs = processor(audio_arrays, sampling_rate=SAMPLE_RATE, return_tensors="pt", padding="max_length")
+        return inputs.input_features
+    
+    # Zero-pad every clip to 30 s, as the feature extractor does
+    chunk_samples = CHUNK_SECONDS * SAMPLE_RATE
+    waves = np.zeros((len(audio_arrays), chunk_samples), dtype=np.float32)
+    for i, audio_array in enumerate(audio_arrays):
+        audio_array = audio_array[:chunk_samples]
+        waves[i, :len(audio_array)] = audio_array
+    
+    waves = torch.from_numpy(waves)
+    if _device.type == "cuda":
+        waves = waves.pin_memory()
+    waves = waves.to(_device, non_blocking=True)
+    
+    with torch.inference_mode():
+        # Last STFT frame is dropped (3000 frames per 30 s)
+        mel = _mel(waves)[..., :-1]
+        
+        # Whisper log-mel normalization (dynamic range of 8 per clip)
+        log_spec = torch.clamp(mel, min=1e-10).log10()
+        max_value = log_spec.amax(dim=(1, 2), keepdim=True)
+        log_spec = torch.maximum(log_spec, max_value - 8.0)
+        return (log_spec + 4.0) / 4.0
+
+
+def _decode_features(model, processor, input_features, language: str) -> List[str]:
+    """
+    Run Whisper on a batch of input features.
+    
+    Args:
+        model: Whisper model
+        processor: Whisper processor
+        input_features: Log-mel features (batch, n_mels, frames)
+        language (str): Language of audio content
+        
+    Returns:
+        List[str]: One transcription per clip
+    """
+    # Move to model device (and dtype: fp16 on GPU), no-op if already there
+    input_features = input_features.to(_device, dtype=_dtype, non_blocking=True)
+    
+    transcriptions = []
+    for features in input_features.split(GENERATE_BATCH_SIZE):
+        transcriptions.extend(_generate(model, processor, features, language))
+    
+    return transcriptions
+
+
+def _generate(model, processor, input_features, language: str) -> List[str]:
+    """Run a single Whisper generate call and decode the token ids."""
+    with torch.inference_mode():
+        predicted_ids = model.generate(
+            input_features,
+            max_new_tokens=MAX_NEW_TOKENS,
+            num_beams=1,
+            do_sample=False,
+            use_cache=True,
+            language=language,
+            task="transcribe",
+            return_timestamps=False
+        )
+    
+    # Decode the results
+    transcriptions = processor.batch_decode(predicted_ids, skip_special_tokens=True)
+    return [transcription.strip() for transcription in transcriptions]
+
+
+def _generate_transcriptions(model, processor, audio_arrays: list, language: str) -> List[str]:
+    """
+    Run Whisper on a batch of audio clips.
+    
+    Args:
+        model: Whisper model
+        processor: Whisper processor
+        audio_arrays (list): 16 kHz mono audio arrays
+        language (str): Language of audio content
+        
+    Returns:
+        List[str]: One transcription per clip
+    """
+    return _decode_features(model, processor, _featurize_groups(processor, audio_arrays), language)
+
+
+def _transcribe_faster_whisper(model, file_path: str, language: str) -> Optional[str]:
+    """
+    Transcribe an audio file with faster-whisper (decodes audio via PyAV/ffmpeg).
+    
+    Args:
+        model: faster-whisper WhisperModel
+        file_path (str): Path to audio file
+        language (str): Language of audio content
+        
+    Returns:
+        Optional[str]: Text transcription or None if error
+    """
+    try:
+        logger.info(f"Transcribing audio file with faster-whisper: {file_path}")
+        segments, _ = model.transcribe(file_path, language=language, beam_size=1, vad_filter=True)
+        
+        # Segments are generated lazily while decoding
+        transcription = "".join(segment.text for segment in segments)
         
         logger.info("Transcription completed successfully")
         return transcription.strip()
         
+    except FileNotFoundError:
+        logger.error(f"Audio file not found: {file_path}")
+        return None
     except Exception as e:
         logger.error(f"Error during transcription of {file_path}: {str(e)}")
         return None
@@ -113,13 +843,9 @@ def transcribe_audio(file_path: str, language: str = "en") -> Optional[str]:
 
 def get_supported_audio_extensions() -> list:
     """Return supported audio extensions."""
-    return ['.mp3', '.wav', '.m4a', '.flac', '.ogg']
+    return sorted(_AUDIO_EXTS)
 
 
 def is_audio_file(file_path: str) -> bool:
     """Check if a file is a supported audio file."""
-    if not file_path:
-        return False
-    
-    file_extension = os.path.splitext(file_path)[1].lower()
-    return file_extension in get_supported_audio_extensions()
+    return bool(file_path) and os.path.splitext(file_path)[1].lower() in _AUDIO_EXTS